@@ -1,13 +1,25 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
+import math
+from concurrent.futures import ProcessPoolExecutor
 from numbers import Number
-from frechet_alg.Algorithm import CellMatrix
+from frechet_alg.Algorithm import CellMatrix, compute_many, compute_modes, \
+    frechet_distance
 from frechet_alg.Geometry import Vector, about_equal
 
 app = Flask(__name__)
 CORS(app)
 
+# max. number of traversals computed and sampled per request
+max_traversals = 10
+# upper limit of the max_traversals a request can ask for
+max_traversals_limit = 100
+# worker processes of the batch route (None: one per CPU)
+batch_workers = None
+# process pool of the batch route (created on first use)
+batch_executor = None
+
 
 def vectors_to_xy(vectors: [Vector]) -> ([float], [float]):
     """ converts array of vectors to x- & y-coordinate arrays """
@@ -44,15 +56,21 @@ def remove_consecutive_equals(vectors):
     return [v for i, v in enumerate(vectors) if i == 0 or v != vectors[i-1]]
 
 
-@app.route("/test")
-def test():
-    return "test: success!"
+def get_batch_executor() -> ProcessPoolExecutor:
+    """ process pool shared by all batch requests """
+    global batch_executor
+    if batch_executor is None:
+        # a misconfiguration, not the fault of the request
+        if batch_workers is not None and \
+                (not isinstance(batch_workers, int) or batch_workers < 1):
+            raise ValueError("Error: invalid batch_workers: " +
+                             str(batch_workers))
+        batch_executor = ProcessPoolExecutor(batch_workers)
+    return batch_executor
 
 
-@app.route("/", methods=['POST'])
-def index():
-    req = request.get_json(force=True)
-    print("=req= ", req)
+def paths_from_request(req) -> ([Vector], [Vector]):
+    """ vectors of the paths p & q of a request """
     path_p = req['p']
     path_q = req['q']
     print("=path_p= ", path_p)
@@ -63,9 +81,69 @@ def index():
     # dispose consecutive equal points
     vec_p = remove_consecutive_equals(vec_p)
     vec_q = remove_consecutive_equals(vec_q)
+    return vec_p, vec_q
+
+
+def max_traversals_from_request(req) -> int:
+    """ max_traversals of a request, clamped to 1 .. max_traversals_limit """
+    value = req.get('max_traversals')
+    if value is None:
+        return max_traversals
+    return min(max(int(value), 1), max_traversals_limit)
+
+
+@app.route("/test")
+def test():
+    return "test: success!"
+
+
+@app.route("/distance", methods=['POST'])
+def distance():
+    """ frechet distance only (decision procedure, no traversals) """
+    req = request.get_json(force=True)
+    print("=req= ", req)
+    vec_p, vec_q = paths_from_request(req)
+    return jsonify({"distance": frechet_distance(vec_p, vec_q)})
+
+
+@app.route("/batch", methods=['POST'])
+def batch():
+    """ distances or matchings of many pairs of paths (process pool) """
+    req = request.get_json(force=True)
+    mode = req.get('mode', 'distance')
+    if mode not in compute_modes:
+        return jsonify({"error": "unknown mode: " + str(mode)}), 400
+    pairs = [paths_from_request(pair) for pair in req['pairs']]
+
+    results = [None] * len(pairs)
+    for i_pair, result in compute_many(pairs, workers=batch_workers,
+                                       mode=mode,
+                                       executor=get_batch_executor()):
+        # failed pairs are NaN, which is not valid JSON
+        if mode == "matching":
+            epsilon, points = result
+            result = {'epsilon': None if math.isnan(epsilon) else epsilon,
+                      'x': points[:, 0].tolist(), 'y': points[:, 1].tolist()}
+        elif math.isnan(result):
+            result = None
+        results[i_pair] = result
+    return jsonify({"mode": mode, "results": results})
+
+
+@app.route("/", methods=['POST'])
+def index():
+    req = request.get_json(force=True)
+    print("=req= ", req)
+    try:
+        n_traversals = max_traversals_from_request(req)
+    except (TypeError, ValueError, OverflowError):
+        return jsonify({"error": "invalid max_traversals: " +
+                        str(req.get('max_traversals'))}), 400
+    vec_p, vec_q = paths_from_request(req)
 
     # calculations
-    cell_matrix = CellMatrix(vec_p, vec_q, traverse=1)
+    cell_matrix = CellMatrix(vec_p, vec_q, traverse=1,
+                             max_traversals=n_traversals)
 
     # sampling
     sample = cell_matrix.sample_l(10, 100, heatmap_n=100)
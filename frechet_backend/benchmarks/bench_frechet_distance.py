@@ -0,0 +1,63 @@
+"""
+Benchmark of the decision-only Frechet distance.
+
+Compares frechet_distance (k-ary search over the critical epsilons with the
+decision procedure) against the epsilon of the full lexicographic traversal,
+CellMatrix(p, q, traverse=1).max_epsilon, on random walks with 5, 10, 20
+and 40 vertices.
+
+usage: python benchmarks/bench_frechet_distance.py [n ...]
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from frechet_alg.Algorithm import CellMatrix, frechet_distance  # noqa: E402
+from frechet_alg.Geometry import Vector, about_equal  # noqa: E402
+
+
+def random_walk(n: int, seed: int) -> [Vector]:
+    rnd = random.Random(seed)
+    x, y = 0.0, 0.0
+    points = []
+    for _ in range(n):
+        x += rnd.uniform(0.5, 1.5)
+        y += rnd.uniform(-1, 1)
+        points.append(Vector(x, y))
+    return points
+
+
+def traversal_distance(p: [Vector], q: [Vector]) -> float:
+    # the algorithm prints its progress, keep it out of the table
+    with contextlib.redirect_stdout(io.StringIO()):
+        return CellMatrix(p, q, traverse=1, max_traversals=1).max_epsilon
+
+
+def timed(f, *args) -> (float, object):
+    start = time.perf_counter()
+    result = f(*args)
+    return time.perf_counter() - start, result
+
+
+def main(sizes: [int]):
+    print("%6s %12s %12s %12s %8s  %s" % (
+        "n", "distance", "traversal", "decision", "speedup", "result"))
+    for n in sizes:
+        p, q = random_walk(n, 1), random_walk(n, 2)
+        t_traversal, d_traversal = timed(traversal_distance, p, q)
+        t_decision, d_decision = timed(frechet_distance, p, q)
+        print("%6d %12.6f %11.3fs %11.3fs %7.1fx  %s" % (
+            n, d_decision, t_traversal, t_decision,
+            t_traversal / t_decision,
+            "equal" if about_equal(d_traversal, d_decision)
+            else "DIFFERENT"))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [5, 10, 20, 40])
@@ -0,0 +1,166 @@
+"""
+Benchmark of the reachable free space (decision procedure).
+
+Compares CellMatrix.decide_traversal (anti-diagonal wavefront over NumPy
+arrays) against the former cell-by-cell implementation, which is kept here
+as reference, on random walks with 100, 500 and 2000 vertices, at 0.9,
+1 and 1.1 times their Frechet distance d, where the wavefront has to
+propagate (far from d, decide_by_bounds settles the decision alone). Also
+reports the share of cells visited by the wavefront.
+
+usage: python benchmarks/bench_reachable_freespace.py [n ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from frechet_alg.Algorithm import CellMatrix, frechet_distance  # noqa: E402
+from frechet_alg.Geometry import Bounds1D, Vector, about_equal, tol  # noqa: E402
+
+
+def random_walk(n: int, seed: int) -> [Vector]:
+    rnd = random.Random(seed)
+    x, y = 0.0, 0.0
+    points = []
+    for _ in range(n):
+        x += rnd.uniform(0.5, 1.5)
+        y += rnd.uniform(-1, 1)
+        points.append(Vector(x, y))
+    return points
+
+
+def decide_traversal_reference(cell_matrix: CellMatrix, a_cm, b_cm,
+                               epsilon: float) -> bool:
+    """
+    decide_traversal as implemented before the wavefront: a double loop over
+    the cells, using Cell.free_bounds_horizontal/free_bounds_vertical.
+    Cells are built from the cell store on the fly (not memoized), as on
+    the first call of the former implementation.
+    """
+    a, cell_a = a_cm
+    b, cell_b = b_cm
+    store = cell_matrix.cell_store
+    p, q = cell_matrix.p, cell_matrix.q
+
+    def cell(i_p, i_q):
+        return store.cell(min(i_p, p.count - 1), min(i_q, q.count - 1))
+
+    if a == b:
+        return True
+    if not a < b:
+        return False
+
+    start_i_p, end_i_p = cell_a[0], cell_b[0]
+    start_i_q, end_i_q = cell_a[1], cell_b[1]
+    while end_i_p > 0 and b.x <= p.offsets[end_i_p]:
+        end_i_p -= 1
+    while start_i_p < end_i_p and a.x >= p.offsets[start_i_p + 1]:
+        start_i_p += 1
+    while end_i_q > 0 and b.y <= q.offsets[end_i_q]:
+        end_i_q -= 1
+    while start_i_q < end_i_q and a.y >= q.offsets[start_i_q + 1]:
+        start_i_q += 1
+
+    d_p = end_i_p - start_i_p + 1
+    d_q = end_i_q - start_i_q + 1
+    if about_equal(a.x, b.x):
+        d_p = 0
+    if about_equal(a.y, b.y):
+        d_q = 0
+
+    offsets_hor = p.offsets[start_i_p: end_i_p + 2].tolist()
+    offsets_hor[0], offsets_hor[-1] = a.x, b.x
+    offsets_ver = q.offsets[start_i_q: end_i_q + 2].tolist()
+    offsets_ver[0], offsets_ver[-1] = a.y, b.y
+    bounds_hor = [Bounds1D(offsets_hor[i], offsets_hor[i + 1])
+                  for i in range(d_p)]
+    bounds_ver = [Bounds1D(offsets_ver[i], offsets_ver[i + 1])
+                  for i in range(d_q)]
+    reachable_hor = [[Bounds1D.nan() for _ in range(d_q + 1)]
+                     for _ in range(d_p)]
+    reachable_ver = [[Bounds1D.nan() for _ in range(d_q)]
+                     for _ in range(d_p + 1)]
+
+    if d_p > 0:
+        for i_p in range(d_p):
+            bottom = bounds_hor[i_p].cut(cell(start_i_p + i_p, start_i_q)
+                                         .free_bounds_horizontal(
+                                             offsets_ver[0], epsilon))
+            if (i_p == 0 and offsets_hor[0] in bottom) or \
+                    (i_p > 0 and bottom.start in reachable_hor[i_p - 1][0]):
+                reachable_hor[i_p][0] = bottom
+    if d_q > 0:
+        for i_q in range(d_q):
+            left = bounds_ver[i_q].cut(cell(start_i_p, start_i_q + i_q)
+                                       .free_bounds_vertical(
+                                           offsets_hor[0], epsilon))
+            if (i_q == 0 and offsets_ver[0] in left) or \
+                    (i_q > 0 and left.start in reachable_ver[0][i_q - 1]):
+                reachable_ver[0][i_q] = left
+    for i_p in range(d_p):
+        for i_q in range(d_q):
+            c = cell(start_i_p + i_p, start_i_q + i_q)
+            left = reachable_ver[i_p][i_q]
+            bottom = reachable_hor[i_p][i_q]
+
+            free_top = bounds_hor[i_p].cut(
+                c.free_bounds_horizontal(offsets_ver[i_q + 1], epsilon))
+            top = Bounds1D.nan()
+            if not left.is_nan():
+                top = free_top
+            elif bottom.start <= free_top.end + tol:
+                top = bounds_hor[i_p].cut(Bounds1D(
+                    max(bottom.start, free_top.start), free_top.end))
+            reachable_hor[i_p][i_q + 1] = top
+
+            free_right = bounds_ver[i_q].cut(
+                c.free_bounds_vertical(offsets_hor[i_p + 1], epsilon))
+            right = Bounds1D.nan()
+            if not bottom.is_nan():
+                right = free_right
+            elif left.start <= free_right.end + tol:
+                right = bounds_ver[i_q].cut(Bounds1D(
+                    max(left.start, free_right.start), free_right.end))
+            reachable_ver[i_p + 1][i_q] = right
+
+    if d_p == 0:
+        return b.y in reachable_ver[-1][-1]
+    if d_q == 0:
+        return b.x in reachable_hor[-1][-1]
+    return (b.x in reachable_hor[-1][-1]) or (b.y in reachable_ver[-1][-1])
+
+
+def timed(f, *args) -> (float, object):
+    start = time.perf_counter()
+    result = f(*args)
+    return time.perf_counter() - start, result
+
+
+def main(sizes: [int]):
+    print("%6s %9s %12s %12s %8s %9s  %s" % (
+        "n", "epsilon", "reference", "wavefront", "speedup", "visited",
+        "decisions"))
+    for n in sizes:
+        p, q = random_walk(n, 1), random_walk(n, 2)
+        cell_matrix = CellMatrix(p, q, traverse=0)
+        d = frechet_distance(p, q)
+        for epsilon in (0.9 * d, d, 1.1 * d):
+            t_reference, d_reference = timed(
+                decide_traversal_reference, cell_matrix, cell_matrix.a_cm,
+                cell_matrix.b_cm, epsilon)
+            t_wavefront, d_wavefront = timed(
+                cell_matrix.decide_traversal, cell_matrix.a_cm,
+                cell_matrix.b_cm, epsilon)
+            print("%6d %9.3f %11.3fs %11.3fs %7.1fx %8.2f%%  %s" % (
+                n, epsilon, t_reference, t_wavefront,
+                t_reference / t_wavefront,
+                100 * cell_matrix.visited_cells.sum() / (n - 1) ** 2,
+                "equal" if d_reference == d_wavefront else "DIFFERENT"))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 500, 2000])
@@ -13,18 +13,45 @@
 # -*- coding: utf-8 -*-
 
 from .Geometry import Bounds1D, Vector, LineSegment, Ellipse, EllipseInfinite, \
-    Hyperbola, Path, about_equal, tol
+    Hyperbola, HyperbolaArray, Path, about_equal, about_equal_array, \
+    contains_array, cut_array, tol
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, \
+    FIRST_COMPLETED, wait
+import bisect
+import contextlib
+import io
+import itertools
 import math
+import os
+import threading
 import numpy as np
 
 CellCoord = (int, int)
 CM_Point = (Vector, CellCoord)
 
+# max. number of cells times epsilons in one batched reachability pass
+batch_cells = 2 ** 22
+# number of epsilons decided per pass of the critical epsilon search
+search_arity = 7
+# max. number of cell borders of the reachable spaces kept per cell matrix
+cache_borders = 2 ** 21
+# max. number of tied best paths through the critical events of one epsilon
+max_best_paths = 64
+# max. number of tasks on the work stack of a traversal
+max_stack_depth = 2 ** 16
+# pairs of curves per task of compute_many
+batch_pairs = 16
+# results compute_many can compute
+compute_modes = ("distance", "matching")
+
 
 class Cell:
     def __init__(self, parallel: bool, p: LineSegment, q: LineSegment,
                  norm_ellipsis: Ellipse, bounds_xy: Bounds1D,
-                 bounds_l: (float, float), offset: Vector = Vector(0, 0)):
+                 bounds_l: (float, float), offset: Vector = Vector(0, 0),
+                 border_hyperbolas: (Hyperbola, Hyperbola, Hyperbola,
+                                     Hyperbola) = None):
         self.parallel = parallel
         # line segments
         self.p = p
@@ -40,11 +67,15 @@ class Cell:
         self.bounds_l = bounds_l  # l length bounds
         self.offset = offset  # offset in cell-matrix
 
-        # border hyperbolas:
-        self.hyperbola_bottom = p.hyperbola_with_point(q.p1).move_x(offset.x)
-        self.hyperbola_top = p.hyperbola_with_point(q.p2).move_x(offset.x)
-        self.hyperbola_left = q.hyperbola_with_point(p.p1).move_x(offset.y)
-        self.hyperbola_right = q.hyperbola_with_point(p.p2).move_x(offset.y)
+        # border hyperbolas: (bottom, top, left, right)
+        if border_hyperbolas is None:
+            border_hyperbolas = (
+                p.hyperbola_with_point(q.p1).move_x(offset.x),
+                p.hyperbola_with_point(q.p2).move_x(offset.x),
+                q.hyperbola_with_point(p.p1).move_x(offset.y),
+                q.hyperbola_with_point(p.p2).move_x(offset.y))
+        (self.hyperbola_bottom, self.hyperbola_top, self.hyperbola_left,
+         self.hyperbola_right) = border_hyperbolas
 
         # steepest descent lines l=l_ver and l'=l_hor
         if not self.parallel:  # case 1: lines are not parallel
@@ -466,6 +497,348 @@ class TwoLineSegments:  # calculates and saves parameters of two line segments
                     self.bounds_l, offset=offset)
 
 
+class CellStore:
+    """
+    Structure-of-arrays storage of the parameters of all cells of a cell
+    matrix. All per-cell arrays are indexed by [i_p, i_q] and built in
+    vectorized passes over the paths p and q. Cell and TwoLineSegments
+    objects are only created on demand as views on the stored parameters.
+    """
+
+    def __init__(self, p: Path, q: Path):
+        self.p = p
+        self.q = q
+        shape = (p.count, q.count)
+
+        # offsets in cell-matrix
+        self.offsets_x, self.offsets_y = np.meshgrid(
+            p.offsets[:-1], q.offsets[:-1], indexing='ij')
+
+        # border hyperbolas (apex s and coefficient a)
+        # horizontal: points of q projected onto segments of p
+        # (p.count x q.count+1), vertical: points of p projected onto
+        # segments of q (p.count+1 x q.count)
+        rl_hor, d_l_hor, d_ls_hor = p.project_points(q.vertices)
+        rl_ver, d_l_ver, d_ls_ver = q.project_points(p.vertices)
+        self.hyperbolas_hor = HyperbolaArray(
+            rl_hor + p.offsets[:-1, np.newaxis], d_l_hor)
+        self.hyperbolas_ver = HyperbolaArray(
+            (rl_ver + q.offsets[:-1, np.newaxis]).T, d_l_ver.T)
+        # bounds of the borders: segments of p (hor) and of q (ver)
+        self.bounds_hor_start = p.offsets[:-1]
+        self.bounds_hor_end = p.offsets[:-1] + p.lengths
+        self.bounds_ver_start = q.offsets[:-1]
+        self.bounds_ver_end = q.offsets[:-1] + q.lengths
+
+        # shortest and longest possible line length
+        d_ls_ver = d_ls_ver.T
+        d_points = np.sqrt(
+            (p.vertices[:, np.newaxis, 0] - q.vertices[np.newaxis, :, 0])**2 +
+            (p.vertices[:, np.newaxis, 1] - q.vertices[np.newaxis, :, 1])**2)
+        self.bounds_l_start = np.minimum(
+            np.minimum(d_ls_hor[:, :-1], d_ls_hor[:, 1:]),
+            np.minimum(d_ls_ver[:-1, :], d_ls_ver[1:, :]))
+        self.bounds_l_end = np.maximum(
+            np.maximum(d_points[:-1, :-1], d_points[:-1, 1:]),
+            np.maximum(d_points[1:, :-1], d_points[1:, 1:]))
+
+        # parallel flags
+        self.parallel = about_equal_array(p.slopes()[:, np.newaxis],
+                                          q.slopes()[np.newaxis, :])
+
+        # case 1: lines are not parallel
+        # intersection point S in parametric terms of both line segments
+        a_d = np.broadcast_to(p.d[:, np.newaxis, :], shape + (2,))
+        b_d = np.broadcast_to(q.d[np.newaxis, :, :], shape + (2,))
+        a_p1 = p.vertices[:-1, np.newaxis, :]
+        b_p1 = q.vertices[np.newaxis, :-1, :]
+        rs_a, rs_b = LineSegment.intersection_r_both_array(a_p1, a_d,
+                                                           b_p1, b_d)
+        self.rs_a = np.where(self.parallel, np.nan, rs_a)
+        self.rs_b = np.where(self.parallel, np.nan, rs_b)
+        # does the intersection point lie on A and B
+        self.intersect = (~self.parallel &
+                          (-tol <= self.rs_a) & (self.rs_a <= 1 + tol) &
+                          (-tol <= self.rs_b) & (self.rs_b <= 1 + tol))
+        # if line segments intersect, set min length to 0
+        self.bounds_l_start[self.intersect] = 0.0
+
+        # normed ellipsis (l=1): midpoint and x-/y-coordinates of axis c & d
+        l_a = p.lengths[:, np.newaxis]
+        l_b = q.lengths[np.newaxis, :]
+        norm_a = a_d / l_a[..., np.newaxis]
+        norm_b = b_d / l_b[..., np.newaxis]
+        with np.errstate(divide='ignore'):
+            self.ellipse_c = 1 / np.sqrt(((norm_a - norm_b)**2).sum(axis=-1))
+            self.ellipse_d = 1 / np.sqrt(((norm_a + norm_b)**2).sum(axis=-1))
+        self.ellipse_m_x = l_a * self.rs_a
+        self.ellipse_m_y = l_b * self.rs_b
+
+        # case 2: lines are parallel
+        # do A and B point in the same direction
+        self.dir_b = (a_d * b_d).sum(axis=-1) >= 0
+        # point with b(0) and minimal l & distance of the two lines
+        w = b_p1 - a_p1
+        self.anchor = (w[..., 0] * a_d[..., 0] + w[..., 1] * a_d[..., 1]) / l_a
+        self.dist = np.abs(a_d[..., 0] * w[..., 1] -
+                           a_d[..., 1] * w[..., 0]) / l_a
+
+    def __len__(self):
+        return self.p.count * self.q.count
+
+    def bounds_l(self) -> Bounds1D:
+        """ real bounds of length l over all cells """
+        return Bounds1D(float(self.bounds_l_start.min()),
+                        float(self.bounds_l_end.max()))
+
+    def hyperbola_hor(self, i_p: int, i_q: int) -> Hyperbola:
+        """ hyperbola on the horizontal border at i_q of segment i_p of p """
+        return self.hyperbolas_hor[i_p, i_q]
+
+    def hyperbola_ver(self, i_p: int, i_q: int) -> Hyperbola:
+        """ hyperbola on the vertical border at i_p of segment i_q of q """
+        return self.hyperbolas_ver[i_p, i_q]
+
+    def free_intervals_hor(self, epsilon: float, i_ps: np.ndarray = None,
+                           i_qs: np.ndarray = None) -> \
+            (np.ndarray, np.ndarray):
+        """
+        free intervals (starts, ends) for epsilon on the horizontal borders
+        (i_ps x i_qs, all if None), like Cell.free_bounds_horizontal
+        epsilon may be an array, its shape is prepended to the result
+        """
+        epsilon = np.asarray(epsilon)[..., np.newaxis, np.newaxis]
+        if i_ps is None:
+            i_ps = np.arange(self.p.count)
+        if i_qs is None:
+            i_qs = np.arange(self.q.count + 1)
+        hyperbolas = self.hyperbolas_hor[i_ps[:, np.newaxis], i_qs]
+        return hyperbolas.free_bounds(epsilon,
+                                      self.bounds_hor_start[i_ps, np.newaxis],
+                                      self.bounds_hor_end[i_ps, np.newaxis])
+
+    def free_intervals_ver(self, epsilon: float, i_ps: np.ndarray = None,
+                           i_qs: np.ndarray = None) -> \
+            (np.ndarray, np.ndarray):
+        """
+        free intervals (starts, ends) for epsilon on the vertical borders
+        (i_ps x i_qs, all if None), like Cell.free_bounds_vertical
+        epsilon may be an array, its shape is prepended to the result
+        """
+        epsilon = np.asarray(epsilon)[..., np.newaxis, np.newaxis]
+        if i_ps is None:
+            i_ps = np.arange(self.p.count + 1)
+        if i_qs is None:
+            i_qs = np.arange(self.q.count)
+        hyperbolas = self.hyperbolas_ver[i_ps[:, np.newaxis], i_qs]
+        return hyperbolas.free_bounds(epsilon, self.bounds_ver_start[i_qs],
+                                      self.bounds_ver_end[i_qs])
+
+    def two_line_segments(self, i_p: int, i_q: int) -> TwoLineSegments:
+        return TwoLineSegments(self.p.segments[i_p], self.q.segments[i_q])
+
+    def cell(self, i_p: int, i_q: int) -> Cell:
+        offset = Vector(self.p.offsets[i_p], self.q.offsets[i_q])
+        parallel = bool(self.parallel[i_p, i_q])
+
+        if not parallel:  # case 1: lines are not parallel
+            c_xy = self.ellipse_c[i_p, i_q]
+            d_xy = self.ellipse_d[i_p, i_q]
+            m = Vector(self.ellipse_m_x[i_p, i_q], self.ellipse_m_y[i_p, i_q])
+            norm_ellipsis = Ellipse(m + offset, Vector(c_xy, c_xy),
+                                    Vector(-d_xy, d_xy))
+        else:  # case 2: lines are parallel
+            if self.dir_b[i_p, i_q]:
+                a = Vector(1, 1)
+            else:
+                a = Vector(-1, 1)
+            anchor = Vector(self.anchor[i_p, i_q], 0)
+            norm_ellipsis = EllipseInfinite(anchor + offset, a,
+                                            float(self.dist[i_p, i_q]))
+
+        # set cell bounds: length of a and b
+        bounds_xy = Bounds1D(float(self.p.lengths[i_p]),
+                             float(self.q.lengths[i_q]))
+        bounds_l = Bounds1D(float(self.bounds_l_start[i_p, i_q]),
+                            float(self.bounds_l_end[i_p, i_q]))
+
+        border_hyperbolas = (self.hyperbola_hor(i_p, i_q),
+                             self.hyperbola_hor(i_p, i_q + 1),
+                             self.hyperbola_ver(i_p, i_q),
+                             self.hyperbola_ver(i_p + 1, i_q))
+
+        return Cell(parallel, self.p.segments[i_p], self.q.segments[i_q],
+                    norm_ellipsis, bounds_xy, bounds_l, offset=offset,
+                    border_hyperbolas=border_hyperbolas)
+
+
+class LazyGrid:
+    """
+    Lazy 2D grid: grid[i][j] calls factory(i, j) on first access and
+    memoizes the result. Used for Cells and TwoLineSegments, so that only
+    the cells actually touched by the algorithm get materialized.
+    """
+
+    def __init__(self, n_i: int, n_j: int, factory):
+        self.n_i = n_i
+        self.n_j = n_j
+        self.factory = factory
+        self._items = {}
+
+    def __len__(self):
+        return self.n_i
+
+    def __getitem__(self, i: int) -> "LazyGridRow":
+        if i < 0:
+            i += self.n_i
+        if not 0 <= i < self.n_i:
+            raise IndexError("Error: LazyGrid row index out of range: " +
+                             str(i))
+        return LazyGridRow(self, i)
+
+    def get(self, i: int, j: int):
+        key = (i, j)
+        item = self._items.get(key)
+        if item is None:
+            item = self.factory(i, j)
+            self._items[key] = item
+        return item
+
+    def count_materialized(self) -> int:
+        """ number of items that have been materialized so far """
+        return len(self._items)
+
+
+class LazyGridRow:
+    def __init__(self, grid: LazyGrid, i: int):
+        self.grid = grid
+        self.i = i
+
+    def __len__(self):
+        return self.grid.n_j
+
+    def __getitem__(self, j: int):
+        if j < 0:
+            j += self.grid.n_j
+        if not 0 <= j < self.grid.n_j:
+            raise IndexError("Error: LazyGrid column index out of range: " +
+                             str(j))
+        return self.grid.get(self.i, j)
+
+
+class TraversalCycleError(RuntimeError):
+    """
+    The traversal of a subproblem does not terminate: it depends on its own
+    traversals, or nests more than max_stack_depth tasks.
+    """
+    pass
+
+
+class LazyList:
+    """
+    Items of an iterator, generated on first access only. Can be iterated
+    any number of times, the iterator is consumed at most once. name is the
+    subproblem the items belong to (for errors).
+    """
+    end = object()
+
+    def __init__(self, iterable, name: str = None):
+        self.iterator = iter(iterable)
+        self.name = name
+        self.items = []
+        # pull: the iterator (a task) is running, abandoned: it was closed
+        # while running and can not be resumed
+        self.pulling = False
+        self.abandoned = False
+
+    def __iter__(self):
+        i = 0
+        while True:
+            if i == len(self.items):
+                item = next(self.iterator, LazyList.end)
+                if item is LazyList.end:
+                    return
+                self.items.append(item)
+            yield self.items[i]
+            i += 1
+
+    def pull(self):
+        """
+        Task (see CellMatrix.run_tasks) of the items, for an iterator that
+        is itself a task: missing items are pulled through the work stack.
+        """
+        i = 0
+        while True:
+            if i == len(self.items):
+                if self.pulling:
+                    raise TraversalCycleError(
+                        "Error: subproblem " + str(self.name) +
+                        " depends on its own traversals")
+                self.pulling = True
+                try:
+                    # the list itself, run_tasks pulls from its iterator
+                    item = yield self
+                except GeneratorExit:
+                    self.abandoned = True
+                    raise
+                self.pulling = False
+                if item is LazyList.end:
+                    return
+                self.items.append(item)
+            yield self.items[i]
+            i += 1
+
+
+class Rope:
+    """
+    Immutable sequence. Joining two ropes is O(1), the result shares both
+    operands instead of copying them; the items are only flattened into a
+    list when they are read.
+    """
+
+    def __init__(self, items: list = None, left: "Rope" = None,
+                 right: "Rope" = None):
+        # a rope is either a leaf (items) or the join left[:-1] + right
+        self.items = items
+        self.left = left
+        self.right = right
+        if items is not None:
+            self.length = len(items)
+        else:
+            self.length = left.length - 1 + right.length
+
+    def __len__(self):
+        return self.length
+
+    def join(self, other: "Rope") -> "Rope":
+        """
+        self[:-1] + other, the last item of self is the first of other
+        """
+        return Rope(left=self, right=other)
+
+    def flatten(self) -> list:
+        if self.items is not None:
+            return self.items
+        # iterative in-order walk, joins can be nested arbitrarily deep
+        items = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                # end of a left operand, drop its shared last item
+                items.pop()
+            elif node.items is not None:
+                items.extend(node.items)
+            else:
+                stack.append(node.right)
+                stack.append(None)
+                stack.append(node.left)
+        # later reads of this rope (and of joins containing it) use the list
+        self.items = items
+        self.left = self.right = None
+        return items
+
+
 class Traversal:
     def __init__(self, cell_matrix: "CellMatrix", a_cm: CM_Point,
                  b_cm: CM_Point, points: [Vector], epsilon: float,
@@ -479,14 +852,25 @@ class Traversal:
         self.b = b_cm[0]
         self.cell_b = b_cm[1]
 
-        self.points = points
+        # points and epsilons are stored as ropes, so concatenations share
+        # the parts of the traversals they are made of
+        self._points = points if isinstance(points, Rope) else Rope(points)
         self.epsilon = epsilon
-        self.epsilons = epsilons
+        self._epsilons = epsilons if isinstance(epsilons, Rope) \
+            else Rope(epsilons)
         self._count = -1
 
         self.reci_sqslope = 0
         self.sqslope2 = 0
 
+    @property
+    def points(self) -> [Vector]:
+        return self._points.flatten()
+
+    @property
+    def epsilons(self) -> [float]:
+        return self._epsilons.flatten()
+
     def __str__(self):
         return "    " + str(self.epsilon) + "-Traversal:" + '\n' + \
                "      A: " + str(self.a) + " -> B: " + str(self.b) + '\n' + \
@@ -509,6 +893,30 @@ class Traversal:
     def is_nan(self) -> bool:
         return math.isinf(self.epsilon)
 
+    def key(self) -> tuple:
+        # geometrically identical traversals have equal keys
+        return tuple((round(point.x, 9), round(point.y, 9))
+                     for point in self.points)
+
+    def to_tuple(self) -> tuple:
+        # plain data of the traversal, without its cell matrix
+        return (self.a.to_tuple(), self.cell_a, self.b.to_tuple(),
+                self.cell_b, [point.to_tuple() for point in self.points],
+                self.epsilon, list(self.epsilons), self.reci_sqslope,
+                self.sqslope2)
+
+    @staticmethod
+    def from_tuple(cell_matrix: "CellMatrix", t: tuple) -> "Traversal":
+        (a, cell_a, b, cell_b, points, epsilon, epsilons, reci_sqslope,
+         sqslope2) = t
+        traversal = Traversal(cell_matrix, (Vector.from_tuple(a), cell_a),
+                              (Vector.from_tuple(b), cell_b),
+                              [Vector.from_tuple(point) for point in points],
+                              epsilon, epsilons)
+        traversal.reci_sqslope = reci_sqslope
+        traversal.sqslope2 = sqslope2
+        return traversal
+
     def __add__(self, other: 'Traversal') -> 'Traversal':
         if self.is_nan():
             return other
@@ -516,9 +924,9 @@ class Traversal:
             return self
 
         traversal = Traversal(self.cell_matrix, self.a_cm, other.b_cm,
-                              self.points[:-1] + other.points,
+                              self._points.join(other._points),
                               max(self.epsilon, other.epsilon),
-                              self.epsilons[:-1] + other.epsilons)
+                              self._epsilons.join(other._epsilons))
 
         # set slopes
         # if the epsilons are equal,
@@ -541,7 +949,7 @@ class Traversal:
 
     def count(self) -> float:
         if self._count == -1:
-            self._count = len(self.points)
+            self._count = len(self._points)
         return self._count
 
     def set_sqslopes(self, sqslopes: [float]):
@@ -555,11 +963,134 @@ class Traversal:
             self.sqslope2 += sqslope2
 
 
+def part_task(part):
+    """
+    Task (see CellMatrix.run_tasks) of the traversals of a part: a list,
+    a LazyList of a task or a task.
+    """
+    if isinstance(part, list):
+        return (traversal for traversal in part)
+    if isinstance(part, LazyList):
+        return part.pull()
+    return part
+
+
+def concatenations(parts: []):
+    """
+    Task (see CellMatrix.run_tasks) of all concatenations of one traversal
+    of every part (in the order of itertools.product), a part is only
+    iterated when the concatenations reach it.
+    """
+    iterators = [part_task(parts[0])]
+    # concatenation of the traversals before part len(iterators) - 1
+    prefixes = [Traversal.nan()]
+    while iterators:
+        traversal = yield iterators[-1]
+        if traversal is LazyList.end:
+            iterators.pop()
+            prefixes.pop()
+            continue
+        prefix = prefixes[-1] + traversal
+        if len(iterators) == len(parts):
+            yield prefix
+        else:
+            prefixes.append(prefix)
+            iterators.append(part_task(parts[len(iterators)]))
+
+
+class CriticalEventsIndex:
+    """
+    Flat index of critical traversals ordered by epsilon, with the
+    coordinates of their start and end points in the free-space diagram.
+    Monotone traversals (a <= b) are additionally sorted by a.x, so a
+    rectangle query only has to look at the traversals starting in its
+    x-range.
+    """
+
+    def __init__(self, dictionary: {}):
+        self.epsilons = sorted(dictionary.keys())
+
+        self.traversals = []
+        starts = [0]
+        for epsilon in self.epsilons:
+            self.traversals += dictionary[epsilon]
+            starts.append(len(self.traversals))
+        self.starts = np.array(starts, dtype=int)
+        self.groups = np.repeat(np.arange(len(self.epsilons)),
+                                np.diff(self.starts))
+
+        self.a_x = np.array([t.a.x for t in self.traversals], dtype=float)
+        self.a_y = np.array([t.a.y for t in self.traversals], dtype=float)
+        self.b_x = np.array([t.b.x for t in self.traversals], dtype=float)
+        self.b_y = np.array([t.b.y for t in self.traversals], dtype=float)
+
+        monotone = less_array(self.a_x, self.b_x) & \
+            less_array(self.a_y, self.b_y)
+        i_monotone = np.flatnonzero(monotone)
+        self.order = i_monotone[np.argsort(self.a_x[i_monotone],
+                                           kind='mergesort')]
+        self.order_a_x = self.a_x[self.order]
+        self.non_monotone = np.flatnonzero(~monotone)
+
+    def __len__(self):
+        return len(self.traversals)
+
+    def range_about(self, epsilon: float) -> (int, int):
+        """
+        range of epsilon indices that are about equal to epsilon
+        """
+        start = bisect.bisect_left(self.epsilons, epsilon)
+        end = bisect.bisect_right(self.epsilons, epsilon, lo=start)
+        while start > 0 and about_equal(self.epsilons[start - 1], epsilon):
+            start -= 1
+        while end < len(self.epsilons) and \
+                about_equal(self.epsilons[end], epsilon):
+            end += 1
+        return start, end
+
+    def in_rectangle(self, a1: Vector, b2: Vector) -> np.ndarray:
+        """
+        sorted indices of traversals with a1 < a and b < b2 (Vector.__lt__)
+        """
+        # traversals starting in [a1.x, b2.x] (widened by the tolerance of
+        # about_equal) and the ones that can't be ordered by a.x
+        start = np.searchsorted(self.order_a_x, a1.x - slack(a1.x), 'left')
+        end = np.searchsorted(self.order_a_x, b2.x + slack(b2.x), 'right')
+        candidates = np.concatenate((self.order[start:end],
+                                     self.non_monotone))
+
+        inside = less_array(a1.x, self.a_x[candidates]) & \
+            less_array(a1.y, self.a_y[candidates]) & \
+            less_array(self.b_x[candidates], b2.x) & \
+            less_array(self.b_y[candidates], b2.y)
+        return np.sort(candidates[inside])
+
+
+def slack(x: float) -> float:
+    """ upper bound of the distance at which about_equal(x, y) holds """
+    return 2 * max(1e-9 * abs(x), tol)
+
+
+def less_array(x1, x2) -> np.ndarray:
+    """ vectorized x1 <= x2 or about_equal(x1, x2) """
+    return (x1 <= x2) | about_equal_array(x1, x2)
+
+
 class CriticalEvents:
+    """
+    Critical traversals grouped by epsilon. The traversals are indexed by
+    their epsilon and by their start and end points, filtering
+    (in_epsilon_bound, remove_epsilon, in_bounds, ...) returns views that
+    select from the index of their parent instead of copying traversals.
+    """
+
     def __init__(self, dictionary: {} = None):
         if dictionary is None:
             dictionary = {}
         self.dictionary = dictionary
+        self._index = None  # CriticalEventsIndex of dictionary (None: dirty)
+        self._selection = None  # sorted indices into _index (None: all)
+        self._epsilons = None
 
     def __str__(self):
         desc = ""
@@ -568,18 +1099,36 @@ class CriticalEvents:
         return desc
 
     def __getitem__(self, item) -> [Traversal]:
-        if item not in self.dictionary:
+        if self._selection is None:
+            if item not in self.dictionary:
+                return []
+            return self.dictionary[item]
+
+        index = self._index
+        i_epsilon = bisect.bisect_left(index.epsilons, item)
+        if i_epsilon == len(index.epsilons) or \
+                index.epsilons[i_epsilon] != item:
             return []
-        return self.dictionary[item]
+        return self._traversals(self._select(index.starts[i_epsilon],
+                                             index.starts[i_epsilon + 1]))
 
     def __len__(self):
-        return len(self.dictionary)
+        if self._selection is None:
+            return len(self.dictionary)
+        if len(self._selection) == 0:
+            return 0
+        groups = self._index.groups[self._selection]
+        return int(np.count_nonzero(groups[1:] != groups[:-1])) + 1
 
     def append(self, traversal: Traversal):
+        if self._selection is not None:
+            self._materialize()
         epsilon = traversal.epsilon
         if epsilon not in self.dictionary:
             self.dictionary[epsilon] = []
         self.dictionary[epsilon].append(traversal)
+        self._index = None
+        self._epsilons = None
 
     def __add__(self, other: "CriticalEvents") -> "CriticalEvents":
         critical_events = CriticalEvents()
@@ -592,70 +1141,109 @@ class CriticalEvents:
         return critical_events
 
     def list(self) -> [Traversal]:
-        sorted_events = []
-        for epsilon in self.epsilons():
-            sorted_events += self[epsilon]
-        return sorted_events
+        if self._selection is None:
+            return list(self.index().traversals)
+        return self._traversals(self._selection)
+
+    def fingerprint(self) -> frozenset:
+        # critical events with equal fingerprints hold the same traversals
+        return frozenset(traversal.key() for traversal in self.list())
 
     def epsilons(self) -> [float]:
-        return sorted(list(self.dictionary.keys()))
+        if self._epsilons is None:
+            index = self.index()
+            if self._selection is None:
+                self._epsilons = index.epsilons
+            else:
+                groups = np.unique(index.groups[self._selection])
+                self._epsilons = [index.epsilons[g] for g in groups]
+        return self._epsilons
+
+    def index(self) -> CriticalEventsIndex:
+        if self._index is None:
+            self._index = CriticalEventsIndex(self.dictionary)
+        return self._index
+
+    def _traversals(self, indices: np.ndarray) -> [Traversal]:
+        traversals = self._index.traversals
+        return [traversals[i] for i in indices.tolist()]
+
+    def _all(self) -> np.ndarray:
+        if self._selection is None:
+            return np.arange(len(self.index()))
+        return self._selection
+
+    def _select(self, start: int, end: int) -> np.ndarray:
+        """ selected indices within [start, end) """
+        selection = self._all()
+        return selection[np.searchsorted(selection, start):
+                         np.searchsorted(selection, end)]
+
+    def _view(self, selection: np.ndarray) -> "CriticalEvents":
+        view = CriticalEvents()
+        view._index = self.index()
+        view._selection = selection
+        return view
+
+    def _materialize(self):
+        # copy the traversals of this view, so it no longer shares storage
+        dictionary = {}
+        for traversal in self.list():
+            dictionary.setdefault(traversal.epsilon, []).append(traversal)
+        self.dictionary = dictionary
+        self._index = None
+        self._selection = None
+        self._epsilons = None
 
     def in_epsilon_bound(self, bound: Bounds1D) -> "CriticalEvents":
-        critical_events_cut = CriticalEvents()
+        index = self.index()
+        if bound.is_nan():
+            return self._view(np.empty(0, dtype=int))
 
-        for epsilon in self.epsilons():
-            if epsilon in bound:
-                for traversal in self[epsilon]:
-                    critical_events_cut.append(traversal)
-
-        return critical_events_cut
+        start = index.range_about(bound.start)[0]
+        end = max(start, index.range_about(bound.end)[1])
+        return self._view(self._select(index.starts[start],
+                                       index.starts[end]))
 
     def remove_epsilon(self, epsilon: float) -> "CriticalEvents":
-        critical_events_cut = CriticalEvents()
-
-        for eps in self.epsilons():
-            if not about_equal(eps, epsilon):
-                for traversal in self[eps]:
-                    critical_events_cut.append(traversal)
+        index = self.index()
+        start, end = index.range_about(epsilon)
 
-        return critical_events_cut
+        return self._view(np.concatenate((
+            self._select(0, index.starts[start]),
+            self._select(index.starts[end], len(index)))))
 
-    def in_bounds(self, a1: Vector, b2: Vector) -> "CriticalEvents":
-        critical_events_cut = CriticalEvents()
+    def _in_rectangle(self, a1: Vector, b2: Vector) -> np.ndarray:
+        indices = self.index().in_rectangle(a1, b2)
+        if self._selection is not None:
+            indices = indices[np.isin(indices, self._selection,
+                                      assume_unique=True)]
+        return indices
 
-        for epsilon in self.epsilons():
-            for traversal in self[epsilon]:
-                b1 = traversal.a
-                a2 = traversal.b
-                if a1 < b1 and a2 < b2 and not (a1 == b1 or a2 == b2):
-                    critical_events_cut.append(traversal)
+    def _equal(self, indices: np.ndarray, x: np.ndarray, y: np.ndarray,
+               v: Vector) -> np.ndarray:
+        return about_equal_array(x[indices], v.x) & \
+            about_equal_array(y[indices], v.y)
 
-        return critical_events_cut
+    def in_bounds(self, a1: Vector, b2: Vector) -> "CriticalEvents":
+        index = self.index()
+        indices = self._in_rectangle(a1, b2)
+        on_bounds = self._equal(indices, index.a_x, index.a_y, a1) | \
+            self._equal(indices, index.b_x, index.b_y, b2)
+        return self._view(indices[~on_bounds])
 
     def in_and_on_bounds_1(self, a1: Vector, b2: Vector) -> 'CriticalEvents':
-        critical_events_cut = CriticalEvents()
-
-        for epsilon in self.epsilons():
-            for traversal in self[epsilon]:
-                b1 = traversal.a
-                a2 = traversal.b
-                if a1 < b1 and a2 < b2:
-                    critical_events_cut.append(traversal)
-
-        return critical_events_cut
+        return self._view(self._in_rectangle(a1, b2))
 
     def in_and_on_bounds_2(self, a1: Vector, b2: Vector) -> 'CriticalEvents':
-        critical_events_cut = CriticalEvents()
-
-        for epsilon in self.epsilons():
-            for traversal in self[epsilon]:
-                b1 = traversal.a
-                a2 = traversal.b
-                if a1 < b1 and a2 < b2 and not (b1 == a2 and
-                                                (a1 == b1 or a2 == b2)):
-                    critical_events_cut.append(traversal)
-
-        return critical_events_cut
+        index = self.index()
+        indices = self._in_rectangle(a1, b2)
+        is_point = about_equal_array(index.a_x[indices],
+                                     index.b_x[indices]) & \
+            about_equal_array(index.a_y[indices], index.b_y[indices])
+        on_bounds = self._equal(indices, index.a_x, index.a_y, a1) | \
+            self._equal(indices, index.b_x, index.b_y, b2)
+        return self._view(indices[~(is_point & on_bounds)])
 
     def critical(self, cell_matrix: 'CellMatrix', a_cm: CM_Point,
                  b_cm: CM_Point) -> (float, [Traversal]):
@@ -666,8 +1254,11 @@ class CriticalEvents:
 
         critical_epsilon = self.critical_helper(cell_matrix, a_cm, b_cm, 0,
                                                 len(self) - 1)
-        for traversal in self[critical_epsilon]:
-            if cell_matrix.decide_critical_traversal(a_cm, traversal, b_cm):
+        candidates = self[critical_epsilon]
+        decisions = cell_matrix.decide_critical_traversals(
+            a_cm, candidates, b_cm)
+        for traversal, decision in zip(candidates, decisions):
+            if decision:
                 traversals.append(traversal)
 
         if len(traversals) == 0:
@@ -677,49 +1268,86 @@ class CriticalEvents:
 
     def critical_helper(self, cell_matrix: 'CellMatrix', a_cm: CM_Point,
                         b_cm: CM_Point, i_start_epsilon: int,
-                        i_end_epsilon: int) -> [Traversal]:
-
+                        i_end_epsilon: int) -> float:
+        """
+        smallest epsilon in [i_start_epsilon, i_end_epsilon) for which b is
+        reachable from a, the epsilon at i_end_epsilon if there is none.
+        """
         epsilons = self.epsilons()
-        if i_start_epsilon + 1 >= i_end_epsilon:
-            start_epsilon = epsilons[i_start_epsilon]
-            if cell_matrix.decide_traversal(a_cm, b_cm, start_epsilon):
-                return start_epsilon
-            return epsilons[i_end_epsilon]
-
-        i_mid_epsilon = i_start_epsilon + int(
-            math.floor(0.5 * (i_end_epsilon - i_start_epsilon)))
-        mid_epsilon = epsilons[i_mid_epsilon]
-
-        decision = cell_matrix.decide_traversal(a_cm, b_cm, mid_epsilon)
-        if decision:
-            return self.critical_helper(cell_matrix, a_cm, b_cm,
-                                        i_start_epsilon, i_mid_epsilon)
-        else:
-            return self.critical_helper(cell_matrix, a_cm, b_cm,
-                                        i_mid_epsilon, i_end_epsilon)
+        return epsilons[cell_matrix.smallest_reachable(
+            a_cm, b_cm, epsilons, i_start_epsilon, i_end_epsilon)]
+
+
+def classify_borders(orientation_left: np.ndarray,
+                     orientation_right: np.ndarray) -> \
+        (np.ndarray, np.ndarray, np.ndarray):
+    """
+    classifies borders by the orientations of the hyperbolas left and right
+    of them: is_minima, is_maxima_1, is_maxima_2
+    """
+    is_minima = (orientation_left <= 0) & (0 <= orientation_right)
+    is_maxima_1 = ((orientation_left >= 0) & (0 > orientation_right)) | \
+        ((orientation_left > 0) & (0 >= orientation_right))
+    is_maxima_2 = (orientation_left > 0) & (0 > orientation_right)
+    return is_minima, is_maxima_1, is_maxima_2
+
+
+class CrossSectionExtrema:
+    """
+    Boolean tables of the local extrema of cross sections of a path.
+    hyperbolas: hyperbolas of the cross sections (k x path.count), or of a
+    single cross section (path.count)
+    minima_no_borders: minimum of segment lies inside it (k x path.count)
+    minima_borders, maxima_1, maxima_2: at path.offsets (k x path.count+1)
+    """
+
+    def __init__(self, path: Path, hyperbolas: HyperbolaArray):
+        offsets = path.offsets
+        xs = hyperbolas.s_x
+
+        self.minima_no_borders = (offsets[:-1] < xs) & (xs < offsets[1:])
+
+        # orientations left and right of every border, the outermost
+        # hyperbolas are reflected over the path ends
+        orientation_left = np.concatenate((
+            hyperbolas[..., 0:1].reflect_x(offsets[0]).orientation(offsets[0]),
+            hyperbolas.orientation(offsets[1:])), axis=-1)
+        orientation_right = np.concatenate((
+            hyperbolas.orientation(offsets[:-1]),
+            hyperbolas[..., -1:].reflect_x(offsets[-1])
+            .orientation(offsets[-1])), axis=-1)
+        self.minima_borders, self.maxima_1, self.maxima_2 = \
+            classify_borders(orientation_left, orientation_right)
+
+    def __getitem__(self, item) -> "CrossSectionExtrema":
+        # extrema of the cross section(s) selected by item
+        extrema = CrossSectionExtrema.__new__(CrossSectionExtrema)
+        extrema.minima_no_borders = self.minima_no_borders[item]
+        extrema.minima_borders = self.minima_borders[item]
+        extrema.maxima_1 = self.maxima_1[item]
+        extrema.maxima_2 = self.maxima_2[item]
+        return extrema
 
 
 class CrossSection:
-    def __init__(self, path: Path, point: Vector):
+    def __init__(self, path: Path, point: Vector,
+                 hyperbolas: HyperbolaArray = None,
+                 extrema: CrossSectionExtrema = None):
         self.path = path
         self.point = point
 
-        self.hyperbolas = []
-        for i_segment in range(len(path.segments)):
-            segment = path.segments[i_segment]
-            hyperbola = segment.hyperbola_with_point(point) \
-                .move_x(path.offsets[i_segment])
-            self.hyperbolas.append(hyperbola)
-
-        self.hyperbolas_overload = \
-            [self.hyperbolas[0].reflect_x(self.path.offsets[0])] + \
-            self.hyperbolas + \
-            [self.hyperbolas[-1].reflect_x(self.path.offsets[-1])]
-        self._minima = []
-        self._minima_no_borders = []
-        self._minima_borders = []
-        self._maxima_1 = []
-        self._maxima_2 = []
+        # hyperbolas of all segments of path with point
+        if hyperbolas is None:
+            hyperbolas = path.hyperbolas_with_point(point)
+        self.hyperbolas = hyperbolas
+
+        # extrema tables (computed on first use if not given)
+        self._extrema = extrema
+        self._minima = None
+        self._minima_no_borders = None
+        self._minima_borders = None
+        self._maxima_1 = None
+        self._maxima_2 = None
 
     def __str__(self):
         desc = ""
@@ -741,79 +1369,108 @@ class CrossSection:
             "Hyperbolas: \n" + str(self)
         return self.hyperbolas[int(item)]
 
+    def extrema(self) -> CrossSectionExtrema:
+        if self._extrema is None:
+            self._extrema = CrossSectionExtrema(self.path, self.hyperbolas)
+        return self._extrema
+
+    def i_border(self, x: float) -> int:
+        """ index of border at x, -1 if x is not a border """
+        i = self.path.i_rl_point(x)
+        if self.path.offsets[i] == x:
+            return i
+        return -1
+
     def minima(self) -> [float]:
         """ returns all local minima """
-        if len(self._minima) == 0:
+        if self._minima is None:
             self._minima = self.minima_no_borders() + self.minima_borders()
         return self._minima
 
     def minima_no_borders(self) -> [float]:
         """ returns local minima that don't lie on borders """
-        if len(self._minima_no_borders) == 0:
-            for i in range(self.path.count):
-                hyperbola = self.hyperbolas[i]
-                bounds = (self.path.offsets[i], self.path.offsets[i + 1])
-                x = hyperbola.s.x
-                if bounds[0] < x < bounds[1]:
-                    self._minima_no_borders.append(x)
+        if self._minima_no_borders is None:
+            self._minima_no_borders = self.hyperbolas.s_x[
+                self.extrema().minima_no_borders].tolist()
         return self._minima_no_borders
 
     def minima_borders(self) -> [float]:
         """ returns local minima that lie on borders """
-        if len(self._minima_borders) == 0:
-            for i in range(self.path.count + 1):
-                x = self.path.offsets[i]
-                left_hyperbola = self.hyperbolas_overload[i]
-                right_hyperbola = self.hyperbolas_overload[i + 1]
-                if left_hyperbola.orientation(x) <= 0 \
-                        <= right_hyperbola.orientation(x):
-                    self._minima_borders.append(x)
+        if self._minima_borders is None:
+            self._minima_borders = self.path.offsets[
+                self.extrema().minima_borders].tolist()
         return self._minima_borders
 
     def is_minima(self, x: float) -> bool:
         """ checks if local minima at set x """
-        if len(self._minima) == 0:
-            self._minima = self.minima()
-        return x in self._minima
+        i_border = self.i_border(x)
+        if i_border >= 0 and self.extrema().minima_borders[i_border]:
+            return True
+        i_segment = self.path.i_rl_path(x)
+        return bool(self.extrema().minima_no_borders[i_segment] and
+                    self.hyperbolas.s_x[i_segment] == x)
 
     def maxima_1(self) -> [float]:
         """returns all local maxima (always on borders) """
-        if len(self._maxima_1) == 0:
-            for i in range(self.path.count + 1):
-                x = self.path.offsets[i]
-                left_hyperbola = self.hyperbolas_overload[i]
-                right_hyperbola = self.hyperbolas_overload[i + 1]
-                orientation_left = left_hyperbola.orientation(x)
-                orientation_right = right_hyperbola.orientation(x)
-                if orientation_left >= 0 > orientation_right or \
-                        orientation_left > 0 >= orientation_right:
-                    self._maxima_1.append(x)
+        if self._maxima_1 is None:
+            self._maxima_1 = self.path.offsets[
+                self.extrema().maxima_1].tolist()
         return self._maxima_1
 
     def maxima_2(self) -> [float]:
         """ returns all local maxima (always on borders) """
-        if len(self._maxima_2) == 0:
-            for i in range(self.path.count + 1):
-                x = self.path.offsets[i]
-                left_hyperbola = self.hyperbolas_overload[i]
-                right_hyperbola = self.hyperbolas_overload[i + 1]
-                orientation_left = left_hyperbola.orientation(x)
-                orientation_right = right_hyperbola.orientation(x)
-                if orientation_left > 0 > orientation_right:
-                    self._maxima_2.append(x)
+        if self._maxima_2 is None:
+            self._maxima_2 = self.path.offsets[
+                self.extrema().maxima_2].tolist()
         return self._maxima_2
 
     def is_maxima_1(self, x: float) -> bool:
         """ checks if local maxima at set x """
-        if len(self._maxima_1) == 0:
-            self._maxima_1 = self.maxima_1()
-        return x in self._maxima_1
+        i_border = self.i_border(x)
+        return i_border >= 0 and bool(self.extrema().maxima_1[i_border])
 
     def is_maxima_2(self, x: float) -> bool:
         """ checks if local maxima at set x """
-        if len(self._maxima_2) == 0:
-            self._maxima_2 = self.maxima_2()
-        return x in self._maxima_2
+        i_border = self.i_border(x)
+        return i_border >= 0 and bool(self.extrema().maxima_2[i_border])
+
+
+def border_extrema(path: Path, points: np.ndarray, i_point: int) -> \
+        (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Point-local extremum test at the border path.offsets[i_point] for the
+    cross sections of path with all given points (k x 2). Only the two
+    hyperbolas next to the border are evaluated, instead of building a
+    whole CrossSection per point.
+    Returns boolean arrays (k) like CrossSection.is_minima (borders),
+    is_maxima_1 and is_maxima_2 would:
+    is_minima, is_maxima_1, is_maxima_2
+    """
+    x = path.offsets[i_point]
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+
+    # left and right hyperbola, reflected over the border at the path ends
+    i_left = max(i_point - 1, 0)
+    i_right = min(i_point, path.count - 1)
+    rl, d_l, _ = path.project_points(points, [i_left, i_right])
+    hyperbola_left = HyperbolaArray(rl[0] + path.offsets[i_left], d_l[0])
+    hyperbola_right = HyperbolaArray(rl[1] + path.offsets[i_right], d_l[1])
+    if i_point == 0:
+        hyperbola_left = hyperbola_right.reflect_x(x)
+    if i_point == path.count:
+        hyperbola_right = hyperbola_left.reflect_x(x)
+
+    return classify_borders(hyperbola_left.orientation(x),
+                            hyperbola_right.orientation(x))
+
+
+def border_extremum(path: Path, point: np.ndarray, i_point: int) -> \
+        (bool, bool, bool):
+    """
+    border_extrema for a single point
+    """
+    return tuple(bool(extrema[0])
+                 for extrema in border_extrema(path, point, i_point))
 
 
 def steepest_descent_helper_point_for_epsilon(
@@ -891,9 +1548,320 @@ def steepest_descent_helper_new_type_critical_2(
     return critical
 
 
+def critical_helper_type_c(hyperbolas: HyperbolaArray,
+                           bounds: Bounds1D) -> [(int, int, float, float)]:
+    """
+    Candidates for critical events of type c on one segment.
+    hyperbolas: hyperbolas of all cross sections on the segment (a = 1)
+    Returns (i_start, i_end, x, epsilon) for all pairs of hyperbolas that
+    intersect critically in bounds with no hyperbola in between above the
+    intersection, ordered by i_start ascending and i_end descending.
+
+    With a = 1 all squared hyperbolas share the x^2 term, so
+    h_k(x)^2 - h_start(x)^2 is linear in x and "h_k below h_start" is a
+    half-line. The x-range where all hyperbolas between i_start and i_end
+    are below h_start is therefore an interval that only shrinks with
+    i_end, which allows an O(n^2) sweep instead of O(n^3) checks. The
+    sweep uses a small slack and the survivors are verified exactly.
+    """
+    n = len(hyperbolas)
+    xs = hyperbolas.s_x
+    ys = hyperbolas.s_y
+    if n < 2:
+        return []
+
+    # intersections of all pairs (start, end)
+    sx_1 = xs[:, np.newaxis]
+    sy_1 = ys[:, np.newaxis]
+    sx_2 = xs[np.newaxis, :]
+    sy_2 = ys[np.newaxis, :]
+    equal_x = about_equal_array(sx_1, sx_2)
+    equal_s = equal_x & about_equal_array(sy_1, sy_2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x = 0.5 * (sy_1**2 + sx_1**2 - sy_2**2 - sx_2**2) / (sx_1 - sx_2)
+    x = np.where(equal_s, sx_1, np.where(equal_x, np.nan, x))
+    x = np.broadcast_to(x, (n, n))
+
+    # critical: in bounds, start falling and end rising
+    start = bounds.start
+    end = bounds.end
+    with np.errstate(invalid='ignore'):
+        in_bounds = ((start <= x) & (x <= end)) | \
+            about_equal_array(start, x) | about_equal_array(end, x)
+        orientation_1 = np.where(about_equal_array(x, sx_1), 0.0, x - sx_1)
+        orientation_2 = np.where(about_equal_array(x, sx_2), 0.0, x - sx_2)
+        candidate = in_bounds & (orientation_1 <= 0.0) & \
+            (0.0 <= orientation_2) & np.triu(np.ones((n, n), dtype=bool), 1)
+
+    # sweep: for every start, the x-interval where all hyperbolas k with
+    # start < k < end are below h_start: (h_k^2 - h_start^2)(x) =
+    # a_k * x + b_k <= slack
+    cs = xs**2 + ys**2
+    x_max = max(abs(start), abs(end))
+    slack = 1e-9 * ((np.abs(xs).max() + x_max)**2 + (ys**2).max() + 1)
+    a = -2 * (sx_2 - sx_1)
+    b = np.broadcast_to(cs[np.newaxis, :] - cs[:, np.newaxis], (n, n))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bound = (slack - b) / a
+    feasible = b <= slack  # for a == 0
+    lower = np.where(a < 0, bound, np.where(a == 0,
+                     np.where(feasible, -np.inf, np.inf), -np.inf))
+    upper = np.where(a > 0, bound, np.where(a == 0,
+                     np.where(feasible, np.inf, -np.inf), np.inf))
+    after_start = np.triu(np.ones((n, n), dtype=bool), 1)
+    lower = np.where(after_start, lower, -np.inf)
+    upper = np.where(after_start, upper, np.inf)
+    # exclusive cumulative max/min: column end covers start < k < end
+    lower = np.maximum.accumulate(lower, axis=1)
+    upper = np.minimum.accumulate(upper, axis=1)
+    lower = np.concatenate((np.full((n, 1), -np.inf), lower[:, :-1]), axis=1)
+    upper = np.concatenate((np.full((n, 1), np.inf), upper[:, :-1]), axis=1)
+    with np.errstate(invalid='ignore'):
+        candidate &= (lower <= x) & (x <= upper)
+
+    # verify survivors exactly, ordered by start asc. and end desc.
+    critical = []
+    for i_start, i_end in sorted(zip(*np.nonzero(candidate)),
+                                 key=lambda t: (t[0], -t[1])):
+        i_start = int(i_start)
+        i_end = int(i_end)
+        x_critical = float(x[i_start, i_end])
+        epsilon = hyperbolas[i_start].fx(x_critical)
+        if math.isnan(x_critical):
+            continue
+        between = hyperbolas[i_start + 1:i_end]
+        if not np.all(epsilon >= between.fx(x_critical)):
+            continue
+        critical.append((i_start, i_end, x_critical, epsilon))
+
+    return critical
+
+
+def mirror(starts: np.ndarray, ends: np.ndarray) -> (np.ndarray, np.ndarray):
+    # intervals on the borders of the diagram mirrored at its center
+    return -ends[..., ::-1, ::-1], -starts[..., ::-1, ::-1]
+
+
+class ReachableSpace:
+    """
+    Reachable space between a and b for one epsilon, propagated once:
+    forward (points reachable from a) or backward (points from which b is
+    reachable). Afterwards every point X between a and b can be decided in
+    O(log n), as decide_traversal(a, X) (or decide_traversal(X, b)) would.
+    Backward the diagram is mirrored at its center, so that both directions
+    are answered by the same recurrence.
+    """
+    def __init__(self, cell_matrix: "CellMatrix", a_cm: CM_Point,
+                 b_cm: CM_Point, epsilon: float, backward: bool = False):
+        self.cell_matrix = cell_matrix
+        self.a_cm = a_cm
+        self.b_cm = b_cm
+        self.epsilon = epsilon
+        self.backward = backward
+        self.sign = -1 if backward else 1
+
+        self.n_borders = 0
+        self.empty = a_cm[0] == b_cm[0] or not a_cm[0] < b_cm[0]
+        if self.empty:
+            return
+
+        offsets_hor, offsets_ver, i_ps_border, i_qs_border = \
+            cell_matrix.reachable_region(a_cm, b_cm)
+        self.i_ps = i_ps_border[1:]
+        self.i_qs = i_qs_border[1:]
+        self.hor = cell_matrix.reachable_freespace(
+            a_cm, b_cm, epsilon, backward)
+        self.ver = self.hor[2:]
+        self.hor = self.hor[:2]
+        if backward:
+            offsets_hor = [-x for x in offsets_hor[::-1]]
+            offsets_ver = [-y for y in offsets_ver[::-1]]
+            self.i_ps = self.i_ps[::-1]
+            self.i_qs = self.i_qs[::-1]
+            self.hor = mirror(*self.hor)
+            self.ver = mirror(*self.ver)
+        self.offsets_hor = offsets_hor
+        self.offsets_ver = offsets_ver
+        self.n_borders = self.hor[0].size + self.ver[0].size
+
+    def contains(self, point: Vector) -> bool:
+        # does the propagated space contain point
+        return not self.empty and self.a_cm[0] < point and \
+            point < self.b_cm[0]
+
+    def reachable(self, point: Vector) -> bool:
+        """
+        forward: is point reachable from a,
+        backward: is b reachable from point
+        """
+        if self.empty:
+            return self.decide(point)
+
+        x = self.sign * point.x
+        y = self.sign * point.y
+        origin = Vector(self.offsets_hor[0], self.offsets_ver[0])
+        corner = Vector(self.offsets_hor[-1], self.offsets_ver[-1])
+        if Vector(x, y) == origin:
+            return True
+        if not origin < Vector(x, y):
+            return False
+        if not Vector(x, y) < corner:
+            return self.decide(point)
+
+        # on the first column or row: reachable along it
+        if about_equal(x, origin.x):
+            j = self.i_cell(self.offsets_ver, y)
+            return y in Bounds1D(self.ver[0][0, j], self.ver[1][0, j])
+        if about_equal(y, origin.y):
+            i = self.i_cell(self.offsets_hor, x)
+            return x in Bounds1D(self.hor[0][i, 0], self.hor[1][i, 0])
+
+        # the cell of the point, truncated at the point like the last cell
+        # of decide_traversal
+        i = self.i_cell(self.offsets_hor, x)
+        j = self.i_cell(self.offsets_ver, y)
+        bounds_hor = Bounds1D(self.offsets_hor[i], x)
+        bounds_ver = Bounds1D(self.offsets_ver[j], y)
+        bottom = Bounds1D(self.hor[0][i, j], self.hor[1][i, j]).cut(
+            bounds_hor)
+        left = Bounds1D(self.ver[0][i, j], self.ver[1][i, j]).cut(bounds_ver)
+        free_top, free_right = self.free_bounds(i, j, x, y)
+        top = self.reachable_exit(left, bottom, free_top.cut(bounds_hor),
+                                  bounds_hor)
+        right = self.reachable_exit(bottom, left, free_right.cut(bounds_ver),
+                                    bounds_ver)
+        return x in top or y in right
+
+    def reachable_many(self, points: [Vector]) -> [bool]:
+        return [self.reachable(point) for point in points]
+
+    def decide(self, point: Vector) -> bool:
+        # points outside of the propagated space
+        if self.backward:
+            return self.cell_matrix.decide_traversal(
+                self.cell_matrix.cm_point_a(point), self.b_cm, self.epsilon)
+        return self.cell_matrix.decide_traversal(
+            self.a_cm, self.cell_matrix.cm_point_b(point), self.epsilon)
+
+    @staticmethod
+    def i_cell(offsets: [float], t: float) -> int:
+        # cell of t, on a border the cell before it
+        return min(max(bisect.bisect_left(offsets, t) - 1, 0),
+                   len(offsets) - 2)
+
+    def free_bounds(self, i: int, j: int, x: float, y: float) -> \
+            (Bounds1D, Bounds1D):
+        # free space at height y and spot x in the cell (i|j)
+        i_p = self.i_ps[i: i + 1]
+        i_q = self.i_qs[j: j + 1]
+        starts_hor, ends_hor = self.cell_matrix.free_intervals_horizontal(
+            self.epsilon, [self.sign * y], i_q.tolist(), i_p)
+        starts_ver, ends_ver = self.cell_matrix.free_intervals_vertical(
+            self.epsilon, [self.sign * x], i_p.tolist(), i_q)
+        free_top = (starts_hor[0, 0], ends_hor[0, 0])
+        free_right = (starts_ver[0, 0], ends_ver[0, 0])
+        if self.backward:
+            free_top = (-free_top[1], -free_top[0])
+            free_right = (-free_right[1], -free_right[0])
+        return Bounds1D(*free_top), Bounds1D(*free_right)
+
+    @staticmethod
+    def reachable_exit(other: Bounds1D, entry: Bounds1D, free_exit: Bounds1D,
+                       bounds: Bounds1D) -> Bounds1D:
+        # like CellMatrix.reachable_border for one cell
+        if not other.is_nan():
+            return free_exit
+        if entry.start <= free_exit.end + tol:
+            return bounds.cut(Bounds1D(max(entry.start, free_exit.start),
+                                       free_exit.end))
+        return Bounds1D.nan()
+
+
+class ReachableSpaceCache:
+    """
+    LRU cache of the ReachableSpaces of a cell matrix, keyed by start and
+    end point with their cells, epsilon and direction. Bounded by the total
+    number of stored borders (max_borders).
+    A forward space from a also decides every point between a and its end,
+    a backward space to b every point between its start and b.
+    """
+    def __init__(self, max_borders: int = cache_borders):
+        self.max_borders = max_borders
+        self.n_borders = 0
+        self.spaces = OrderedDict()
+        # keys of the spaces by (anchor x, anchor y, epsilon, backward)
+        self.anchors = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.spaces)
+
+    @staticmethod
+    def key(a_cm: CM_Point, b_cm: CM_Point, epsilon: float,
+            backward: bool) -> tuple:
+        return (a_cm[0].x, a_cm[0].y, tuple(a_cm[1]), b_cm[0].x, b_cm[0].y,
+                tuple(b_cm[1]), epsilon, backward)
+
+    @staticmethod
+    def anchor(key: tuple) -> tuple:
+        # backward spaces are anchored at b, forward spaces at a
+        if key[7]:
+            return key[3], key[4], key[6], True
+        return key[0], key[1], key[6], False
+
+    def get(self, key: tuple) -> "ReachableSpace":
+        space = self.spaces.get(key)
+        if space is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.spaces.move_to_end(key)
+        return space
+
+    def put(self, key: tuple, space: "ReachableSpace"):
+        self.spaces[key] = space
+        self.anchors.setdefault(self.anchor(key), set()).add(key)
+        self.n_borders += space.n_borders
+        # evict least recently used spaces, but always keep the new one
+        while self.n_borders > self.max_borders and len(self.spaces) > 1:
+            old_key, old_space = self.spaces.popitem(last=False)
+            self.n_borders -= old_space.n_borders
+            keys = self.anchors[self.anchor(old_key)]
+            keys.discard(old_key)
+            if len(keys) == 0:
+                del self.anchors[self.anchor(old_key)]
+
+    def decide(self, a_cm: CM_Point, b_cm: CM_Point, epsilon: float) -> \
+            bool:
+        """
+        decides if b is reachable from a with a stored space, forward from
+        a or backward to b, that contains the rectangle between a and b.
+        Returns None if there is none.
+        """
+        a = a_cm[0]
+        b = b_cm[0]
+        for anchor, point in (((a.x, a.y, epsilon, False), b),
+                              ((b.x, b.y, epsilon, True), a)):
+            for key in self.anchors.get(anchor, ()):
+                space = self.spaces[key]
+                if space.contains(point):
+                    self.hits += 1
+                    self.spaces.move_to_end(key)
+                    return space.reachable(point)
+        self.misses += 1
+        return None
+
+    def clear(self):
+        self.spaces.clear()
+        self.anchors.clear()
+        self.n_borders = 0
+
+
 class CellMatrix:
     def __init__(self, points_p: [Vector], points_q: [Vector],
-                 traverse: int = 1):
+                 traverse: int = 1, max_traversals: int = None,
+                 executor: Executor = None):
         # paths
         self.p = Path(points_p)
         self.q = Path(points_q)
@@ -903,38 +1871,53 @@ class CellMatrix:
         self.b_cm = (Vector(self.p.length, self.q.length),
                      (self.p.count - 1, self.q.count - 1))
 
+        # cell parameters
+        self.cell_store = CellStore(self.p, self.q)
         # real bounds of length l over the whole cell matrix
-        self.bounds_l = Bounds1D(math.inf, 0)
-
-        # border hyperbolas
-        self.cross_sections_hor = self.calculate_cross_sections(self.p,
-                                                                self.q.points)
-        self.cross_sections_ver = self.calculate_cross_sections(self.q,
-                                                                self.p.points)
-
-        # generate and save TwoLineSegments & Cells
-        self.twoLSs = []
-        self.cells = []
-        for i_p in range(self.p.count):
-            self.twoLSs.append([])
-            self.cells.append([])
-            for i_q in range(self.q.count):
-                two_line_segments = TwoLineSegments(self.p.segments[i_p],
-                                                    self.q.segments[i_q])
-                self.bounds_l = Bounds1D(min(self.bounds_l[0],
-                                             two_line_segments.bounds_l[0]),
-                                         max(self.bounds_l[1],
-                                             two_line_segments.bounds_l[1]))
-                self.twoLSs[i_p].append(two_line_segments)
-                cell = two_line_segments.cell(offset=Vector(
-                    self.p.offsets[i_p], self.q.offsets[i_q]))
-                self.cells[i_p].append(cell)
-
-        # critical events
-        self.critical_events = self.calculate_critical_events()
-
-        # traverse
+        self.bounds_l = self.cell_store.bounds_l()
+
+        # border hyperbolas & tables of their extrema
+        self.extrema_hor = CrossSectionExtrema(
+            self.p, self.cell_store.hyperbolas_hor.T)
+        self.extrema_ver = CrossSectionExtrema(
+            self.q, self.cell_store.hyperbolas_ver)
+        self.cross_sections_hor = self.calculate_cross_sections(
+            self.p, self.q.points, self.cell_store.hyperbolas_hor.T,
+            self.extrema_hor)
+        self.cross_sections_ver = self.calculate_cross_sections(
+            self.q, self.p.points, self.cell_store.hyperbolas_ver,
+            self.extrema_ver)
+
+        # TwoLineSegments & Cells (materialized on first access)
+        self.twoLSs = LazyGrid(self.p.count, self.q.count,
+                               self.cell_store.two_line_segments)
+        self.cells = LazyGrid(self.p.count, self.q.count,
+                              self.cell_store.cell)
+
+        # critical events (calculated on first access)
+        self._critical_events = None
+
+        # cells visited by the last reachability pass (per epsilon)
+        self.visited_cells = np.zeros(0, dtype=int)
+        # reachable spaces of previous decisions
+        self.reachable_cache = ReachableSpaceCache()
+        # traversal subproblems started & max. number of tasks on the stack
+        self.subproblems = 0
+        self.peak_stack_depth = 0
+        # traversals of the subproblems by subproblem_key (LazyList)
+        self.subproblem_memo = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+        # thread or process pool for independent subproblems (None: serial).
+        # A submitted subproblem is solved with all its traversals and the
+        # b4 -> b3 side of a split is submitted before the a3 -> a4 side is
+        # known to have one, so with max_traversals some work is done that
+        # the serial traversal would skip; paths are still submitted lazily.
+        self.executor = executor
+
+        # traverse (at most max_traversals traversals, all if None)
         self.traverse = traverse
+        self.max_traversals = max_traversals
         self.max_epsilon = math.inf
         if traverse > 0:
             self.max_epsilon, self.traversals = self.do_traverse()
@@ -985,11 +1968,17 @@ class CellMatrix:
         return desc
 
     @staticmethod
-    def calculate_cross_sections(path, points) -> [CrossSection]:
+    def calculate_cross_sections(
+            path: Path, points: [Vector],
+            hyperbolas: HyperbolaArray = None,
+            extrema: CrossSectionExtrema = None) -> [CrossSection]:
         cross_sections = []
 
-        for point in points:
-            cross_section = CrossSection(path, point)
+        for i_point, point in enumerate(points):
+            cross_section = CrossSection(
+                path, point,
+                hyperbolas[i_point] if hyperbolas is not None else None,
+                extrema[i_point] if extrema is not None else None)
             cross_sections.append(cross_section)
 
         return cross_sections
@@ -999,77 +1988,62 @@ class CellMatrix:
             cross_sections: [CrossSection],
             other_cross_sections: [CrossSection]) -> [[Vector]]:
         critical_points = []
-        n_cross_sections = len(cross_sections)
         path = cross_sections[0].path
         other_path = other_cross_sections[0].path
 
         # events of type b
         for i_cross_section in range(1, len(cross_sections) - 1):
             cross_section = cross_sections[i_cross_section]
+            y = other_path.offsets[i_cross_section]
 
             # no borders
             minima_no_borders = cross_section.minima_no_borders()
-            for x in minima_no_borders:
-                other_cross_section = CrossSection(other_path, path.p_rl(x))
-                y = other_path.offsets[i_cross_section]
-                if other_cross_section.is_maxima_1(y):
-                    critical_points.append([Vector(x, y)])
+            if len(minima_no_borders) > 0:
+                _, is_maxima_1, _ = border_extrema(
+                    other_path, path.p_rls(minima_no_borders), i_cross_section)
+                for x, is_maxima in zip(minima_no_borders, is_maxima_1):
+                    if is_maxima:
+                        critical_points.append([Vector(x, y)])
 
             # borders
             minima_borders = cross_section.minima_borders()
-            for x in minima_borders:
-                other_cross_section = other_cross_sections[path.i_rl_point(x)]
-                y = other_path.offsets[i_cross_section]
-                if other_cross_section.is_maxima_1(y):
-                    critical_points.append([Vector(x, y)])
+            if len(minima_borders) > 0:
+                points = path.vertices[path.i_rl_points(minima_borders)]
+                _, is_maxima_1, _ = border_extrema(
+                    other_path, points, i_cross_section)
+                for x, is_maxima in zip(minima_borders, is_maxima_1):
+                    if is_maxima:
+                        critical_points.append([Vector(x, y)])
 
         # events of type c
+        hyperbolas = HyperbolaArray(
+            np.stack([cross_section.hyperbolas.s_x
+                      for cross_section in cross_sections]),
+            np.stack([cross_section.hyperbolas.s_y
+                      for cross_section in cross_sections]))
         for i_section in range(path.count):
             bounds = Bounds1D(path.offsets[i_section],
                               path.offsets[i_section + 1])
-            for i_start in range(n_cross_sections):
-                cross_section_start = cross_sections[i_start]
-                hyperbola_start = cross_section_start[i_section]
-                for i_end in range(n_cross_sections - 1, i_start, -1):
-                    cross_section_end = cross_sections[i_end]
-                    hyperbola_end = cross_section_end[i_section]
-
-                    intersections = hyperbola_start \
-                        .intersects_hyperbola_in_bounds_critical(
-                        hyperbola_end, bounds)
-                    if len(intersections) == 0:
-                        continue
-                    intersection = intersections[0]
-                    x = intersection.x
-                    if math.isnan(x):
-                        continue
-
-                    other_cross_section = CrossSection(other_path,
-                                                       path.p_rl(x))
-                    if not other_cross_section.is_maxima_2(
-                            other_path.offsets[i_start]) or \
-                            not other_cross_section.is_maxima_2(
-                                other_path.offsets[i_end]):
-                        continue
+            criticals = critical_helper_type_c(hyperbolas[:, i_section],
+                                               bounds)
+            for i_start, i_end, x, epsilon in criticals:
+                point = path.p_rls([x])
+                if not border_extremum(other_path, point, i_start)[2] or \
+                        not border_extremum(other_path, point, i_end)[2]:
+                    continue
 
-                    is_critical = True
-                    i_between = i_start + 1
-                    points = [Vector(x, other_path.offsets[i_start])]
-                    while is_critical and i_between < i_end:
-                        cross_section_between = cross_sections[i_between]
-                        hyperbola_between = cross_section_between[i_section]
-                        points.append((
-                            Vector(x, other_path.offsets[i_between])))
-                        is_critical = is_critical and intersection.y >= \
-                                      hyperbola_between.fx(intersection.x)
-                        i_between += 1
-                    points.append(Vector(x, other_path.offsets[i_end]))
-
-                    if is_critical:
-                        critical_points.append(points)
+                points = [Vector(x, other_path.offsets[i_between])
+                          for i_between in range(i_start, i_end + 1)]
+                critical_points.append(points)
 
         return critical_points
 
+    @property
+    def critical_events(self) -> CriticalEvents:
+        if self._critical_events is None:
+            self._critical_events = self.calculate_critical_events()
+        return self._critical_events
+
     def calculate_critical_events(self) -> CriticalEvents:
         critical_events = CriticalEvents()
 
@@ -1090,6 +2064,36 @@ class CellMatrix:
 
         return critical_events
 
+    def critical_epsilons(self) -> [float]:
+        """
+        sorted epsilons of the critical events, without building their
+        traversals
+        """
+        epsilons = set()
+        for points in self.calculate_critical_points(
+                self.cross_sections_ver, self.cross_sections_hor):
+            epsilons.add(max(self.epsilon_from_point(point.x_to_y())
+                             for point in points))
+        for points in self.calculate_critical_points(
+                self.cross_sections_hor, self.cross_sections_ver):
+            epsilons.add(max(self.epsilon_from_point(point)
+                             for point in points))
+        return sorted(epsilons)
+
+    def frechet_distance(self) -> float:
+        """
+        Frechet distance by the decision procedure alone: the smallest
+        critical epsilon (at least the epsilon at a and b) for which b is
+        reachable from a. No traversal is built.
+        """
+        epsilon_ab = max(self.epsilon_from_cm_point(self.a_cm),
+                         self.epsilon_from_cm_point(self.b_cm))
+        epsilons = [epsilon_ab] + [epsilon
+                                   for epsilon in self.critical_epsilons()
+                                   if epsilon > epsilon_ab]
+        return epsilons[self.smallest_reachable(
+            self.a_cm, self.b_cm, epsilons, 0, len(epsilons) - 1)]
+
     def decide_critical_traversal(self, a1_cm: CM_Point, traversal: Traversal,
                                   b2_cm: CM_Point) -> bool:
         epsilon = traversal.epsilon
@@ -1099,27 +2103,131 @@ class CellMatrix:
         decision2 = self.decide_traversal(a2_cm, b2_cm, epsilon)
         return decision1 and decision2
 
-    def generate_reachable_freespace(
-            self, a_cm: CM_Point, b_cm: CM_Point, epsilon: float) -> \
-            ([[Bounds1D]], [[Bounds1D]]):
+    def decide_critical_traversals(self, a1_cm: CM_Point,
+                                   traversals: [Traversal],
+                                   b2_cm: CM_Point) -> [bool]:
         """
-            Returns two matrices: reachable_hor and reachable_ver
-            For all cells (i_p|i_q), the matrices describe the reachable space
-            (given epsilon) for the bottom and left border.
+            decide_critical_traversal for many traversals: per epsilon, the
+            space reachable from a1 and the space reaching b2 are
+            propagated once and then queried for all traversals.
+        """
+        spaces = {}
+        decisions = []
+        for traversal in traversals:
+            if traversal.epsilon not in spaces:
+                spaces[traversal.epsilon] = (
+                    self.reachable_space(a1_cm, b2_cm, traversal.epsilon),
+                    self.reachable_space(a1_cm, b2_cm, traversal.epsilon,
+                                         backward=True))
+            forward, backward = spaces[traversal.epsilon]
+            decisions.append(forward.reachable(traversal.a) and
+                             backward.reachable(traversal.b))
+        return decisions
+
+    def reachable_space(self, a_cm: CM_Point, b_cm: CM_Point, epsilon: float,
+                        backward: bool = False) -> ReachableSpace:
+        key = ReachableSpaceCache.key(a_cm, b_cm, epsilon, backward)
+        space = self.reachable_cache.get(key)
+        if space is None:
+            space = ReachableSpace(self, a_cm, b_cm, epsilon, backward)
+            self.reachable_cache.put(key, space)
+        return space
+
+    def free_intervals(self, epsilon: float) -> \
+            (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+        """
+            Returns the free intervals for epsilon on all cell borders:
+            hor_start, hor_end (p.count x q.count+1) on the horizontal and
+            ver_start, ver_end (p.count+1 x q.count) on the vertical
+            borders. Empty intervals are (inf, -inf).
+            epsilon may be an array, its shape is prepended to the results.
         """
+        return self.cell_store.free_intervals_hor(epsilon) + \
+            self.cell_store.free_intervals_ver(epsilon)
 
+    def free_intervals_horizontal(self, epsilon: float, ys: [float],
+                                  i_qs: [int], i_ps: np.ndarray) -> \
+            (np.ndarray, np.ndarray):
+        """
+        free intervals (len(i_ps) x len(ys)) for epsilon in the cells
+        (i_ps|i_qs[k]) at heights ys[k], like Cell.free_bounds_horizontal
+        epsilon may be an array, its shape is prepended to the result
+        """
+        i_borders, interior = self.border_indices(self.q, ys, i_qs)
+        starts, ends = self.cell_store.free_intervals_hor(
+            epsilon, i_ps, np.maximum(i_borders, 0))
+        starts[..., i_borders < 0] = math.inf
+        ends[..., i_borders < 0] = -math.inf
+        for k in interior:
+            point = self.q[i_qs[k]].frl(ys[k] - self.q.offsets[i_qs[k]])
+            starts[..., k], ends[..., k] = \
+                self.p.segment_hyperbolas_with_point(point, i_ps).free_bounds(
+                np.asarray(epsilon)[..., np.newaxis],
+                self.cell_store.bounds_hor_start[i_ps],
+                self.cell_store.bounds_hor_end[i_ps])
+        return starts, ends
+
+    def free_intervals_vertical(self, epsilon: float, xs: [float],
+                                i_ps: [int], i_qs: np.ndarray) -> \
+            (np.ndarray, np.ndarray):
+        """
+        free intervals (len(xs) x len(i_qs)) for epsilon in the cells
+        (i_ps[k]|i_qs) at spots xs[k], like Cell.free_bounds_vertical
+        epsilon may be an array, its shape is prepended to the result
+        """
+        i_borders, interior = self.border_indices(self.p, xs, i_ps)
+        starts, ends = self.cell_store.free_intervals_ver(
+            epsilon, np.maximum(i_borders, 0), i_qs)
+        starts[..., i_borders < 0, :] = math.inf
+        ends[..., i_borders < 0, :] = -math.inf
+        for k in interior:
+            point = self.p[i_ps[k]].frl(xs[k] - self.p.offsets[i_ps[k]])
+            starts[..., k, :], ends[..., k, :] = \
+                self.q.segment_hyperbolas_with_point(point, i_qs).free_bounds(
+                np.asarray(epsilon)[..., np.newaxis],
+                self.cell_store.bounds_ver_start[i_qs],
+                self.cell_store.bounds_ver_end[i_qs])
+        return starts, ends
+
+    @staticmethod
+    def border_indices(path: Path, ts: [float], i_segments: [int]) -> \
+            (np.ndarray, [int]):
+        """
+        indices of the borders at ts[k] of the segments i_segments[k] of
+        path (-1 if ts[k] is not on the segment or inside it), and the k for
+        which ts[k] lies inside the segment
+        """
+        i_borders = []
+        interior = []
+        for k, (t, i_segment) in enumerate(zip(ts, i_segments)):
+            bounds = Bounds1D(path.offsets[i_segment],
+                              path.offsets[i_segment] +
+                              path.lengths[i_segment])
+            if t not in bounds:
+                i_borders.append(-1)
+            elif about_equal(t, bounds[0]):
+                i_borders.append(i_segment)
+            elif about_equal(t, bounds[1]):
+                i_borders.append(i_segment + 1)
+            else:
+                i_borders.append(-1)
+                interior.append(k)
+        return np.array(i_borders, dtype=int), interior
+
+    def reachable_region(self, a_cm: CM_Point, b_cm: CM_Point) -> \
+            ([float], [float], np.ndarray, np.ndarray):
+        """
+            Returns the offsets of the borders between a and b (offsets_hor:
+            d_p+1, offsets_ver: d_q+1, starting at a and ending at b) and
+            the cells (clamped to the cell matrix) of these borders: the
+            first border lies in the first cell, all others are top/right
+            borders of the previous cell.
+        """
         a = a_cm[0]
         cell_a = a_cm[1]
         b = b_cm[0]
         cell_b = b_cm[1]
 
-        if a == b or not a < b:
-            return [], []
-
-        cells = self.cells.copy()
-        cells.append(cells[-1])
-        cells = [cells_col + [cells_col[-1]] for cells_col in cells]
-
         start_i_p = cell_a[0]
         end_i_p = cell_b[0]
         start_i_q = cell_a[1]
@@ -1141,122 +2249,437 @@ class CellMatrix:
         if about_equal(a.y, b.y):
             d_q = 0
 
-        offsets_hor = self.p.offsets[start_i_p: end_i_p + 2]
+        offsets_hor = self.p.offsets[start_i_p: end_i_p + 2].tolist()
         offsets_hor[0] = a.x
         offsets_hor[-1] = b.x
-        offsets_ver = self.q.offsets[start_i_q: end_i_q + 2]
+        offsets_ver = self.q.offsets[start_i_q: end_i_q + 2].tolist()
         offsets_ver[0] = a.y
         offsets_ver[-1] = b.y
 
-        bounds_hor = [Bounds1D(offsets_hor[i_p], offsets_hor[i_p + 1])
-                      for i_p in range(d_p)]
-        bounds_ver = [Bounds1D(offsets_ver[i_q], offsets_ver[i_q + 1])
-                      for i_q in range(d_q)]
+        i_ps = np.minimum(start_i_p + np.arange(d_p), self.p.count - 1)
+        i_qs = np.minimum(start_i_q + np.arange(d_q), self.q.count - 1)
+        return offsets_hor[:d_p + 1], offsets_ver[:d_q + 1], \
+            np.concatenate(([start_i_p], i_ps)), \
+            np.concatenate(([start_i_q], i_qs))
+
+    def reachable_freespace(
+            self, a_cm: CM_Point, b_cm: CM_Point, epsilon: float,
+            backward: bool = False, cells: np.ndarray = None) -> \
+            (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+        """
+            Returns the reachable space (given epsilon) on the borders
+            between a and b as arrays of interval starts and ends:
+            hor_start, hor_end (d_p x d_q+1) for the bottom borders and
+            ver_start, ver_end (d_p+1 x d_q) for the left borders of all
+            cells (i_p|i_q). Empty intervals are (inf, -inf).
+            epsilon may be an array of epsilons, its shape is prepended to
+            the results.
+            backward: instead the space from which b is reachable, the
+            propagation runs on the diagram mirrored at its center.
+            cells: cells (d_p x d_q) that can be part of a traversal, all
+            others are skipped, by default the cells whose bounds_l lower
+            bound does not exceed epsilon.
+            The number of visited cells per epsilon is kept in
+            self.visited_cells.
+        """
+        offsets_hor, offsets_ver, i_ps_border, i_qs_border = \
+            self.reachable_region(a_cm, b_cm)
+        i_ps = i_ps_border[1:]
+        i_qs = i_qs_border[1:]
+        shape = np.shape(epsilon)
+        if cells is None:
+            cells = self.open_cells(epsilon, i_ps, i_qs)
+        cells = np.broadcast_to(cells, shape + (len(i_ps), len(i_qs)))
+
+        bounds_hor = (np.array(offsets_hor[:-1])[:, np.newaxis],
+                      np.array(offsets_hor[1:])[:, np.newaxis])
+        bounds_ver = (np.array(offsets_ver[:-1]), np.array(offsets_ver[1:]))
+
+        # free space on all borders (hor: d_p x d_q+1, ver: d_p+1 x d_q)
+        free_hor = cut_array(*bounds_hor, *self.free_intervals_horizontal(
+            epsilon, offsets_ver, i_qs_border, i_ps))
+        free_ver = cut_array(*bounds_ver, *self.free_intervals_vertical(
+            epsilon, offsets_hor, i_ps_border, i_qs))
+
+        if not backward:
+            *reachable, self.visited_cells = self.propagate_reachable(
+                offsets_hor, offsets_ver, free_hor, free_ver, cells)
+            return tuple(reachable)
+
+        hor_start, hor_end, ver_start, ver_end, self.visited_cells = \
+            self.propagate_reachable(
+                [-x for x in offsets_hor[::-1]],
+                [-y for y in offsets_ver[::-1]],
+                mirror(*free_hor), mirror(*free_ver), cells[..., ::-1, ::-1])
+        return mirror(hor_start, hor_end) + mirror(ver_start, ver_end)
+
+    def open_cells(self, epsilon: float, i_ps: np.ndarray,
+                   i_qs: np.ndarray) -> np.ndarray:
+        """
+        cells (len(i_ps) x len(i_qs)) whose bounds_l lower bound does not
+        exceed epsilon, all others have no free space at all
+        epsilon may be an array, its shape is prepended to the result
+        """
+        lower = self.cell_store.bounds_l_start[np.ix_(i_ps, i_qs)]
+        return lower <= np.asarray(epsilon)[..., np.newaxis, np.newaxis] + \
+            self.prune_slack(epsilon)
 
-        reachable_hor = [[Bounds1D.nan() for i_q in range(d_q + 1)]
-                         for i_p in range(d_p)]
-        reachable_ver = [[Bounds1D.nan() for i_q in range(d_q)]
-                         for i_p in range(d_p + 1)]
+    def prune_slack(self, epsilon: float) -> float:
+        # the free intervals are compared with tolerances relative to the
+        # offsets on the paths, cells are only pruned beyond them
+        max_epsilon = max(float(np.max(epsilon)), 0) if np.size(epsilon) \
+            else 0
+        return 4 * slack(max(max_epsilon, self.p.length, self.q.length))
 
-        start_cell = cells[start_i_p][start_i_q]
+    @staticmethod
+    def coarse_reachable(cells: np.ndarray) -> np.ndarray:
+        """
+        cells (mask ... x d_p x d_q) reachable from the first cell through
+        cells of the mask by steps to the right or top neighbour, every
+        traversal only passes such cells
+        """
+        reachable = np.zeros_like(cells)
+        seeds = np.zeros(cells.shape[:-2] + cells.shape[-1:], dtype=bool)
+        seeds[..., 0] = True
+        for i_p in range(cells.shape[-2]):
+            column = cells[..., i_p, :]
+            # runs of cells in the column, reachable after the first seed
+            runs = np.cumsum(~column, axis=-1)
+            seeded = np.where(column & seeds, runs, -1)
+            reachable[..., i_p, :] = column & (
+                np.maximum.accumulate(seeded, axis=-1) == runs)
+            seeds = reachable[..., i_p, :]
+        return reachable
+
+    @staticmethod
+    def propagate_reachable(offsets_hor: [float], offsets_ver: [float],
+                            free_hor: (np.ndarray, np.ndarray),
+                            free_ver: (np.ndarray, np.ndarray),
+                            cells: np.ndarray) -> \
+            (np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+        """
+            Propagates the reachable space from the first corner
+            (offsets_hor[0]|offsets_ver[0]) through the free space on the
+            borders (see reachable_freespace), only through cells (mask
+            d_p x d_q) that can be part of a traversal.
+            The cells are processed by anti-diagonals, all cells on one
+            anti-diagonal only depend on the previous one. Every diagonal is
+            narrowed to its cells with a reachable entry, the propagation
+            stops at the first diagonal without any.
+            Also returns the number of visited cells (per epsilon).
+        """
+        d_p = len(offsets_hor) - 1
+        d_q = len(offsets_ver) - 1
+        bounds_hor = (np.array(offsets_hor[:-1]), np.array(offsets_hor[1:]))
+        bounds_ver = (np.array(offsets_ver[:-1]), np.array(offsets_ver[1:]))
+
+        shape = free_hor[0].shape[:-2]
+        hor_start = np.full(shape + (d_p, d_q + 1), math.inf)
+        hor_end = np.full(shape + (d_p, d_q + 1), -math.inf)
+        ver_start = np.full(shape + (d_p + 1, d_q), math.inf)
+        ver_end = np.full(shape + (d_p + 1, d_q), -math.inf)
 
         # build up reachable freespace on borders for given epsilon
-        # bottom row
+        # bottom row: reachable as long as every border is entered within
+        # the free space of the previous one
         if d_p > 0:
-            reachable_bottom = bounds_hor[0].cut(
-                start_cell.free_bounds_horizontal(offsets_ver[0], epsilon))
-            if offsets_hor[0] in reachable_bottom:
-                reachable_hor[0][0] = reachable_bottom
-            for i_p in range(1, d_p):
-                cell = cells[start_i_p + i_p][start_i_q]
-                reachable_bottom = bounds_hor[i_p].cut(
-                    cell.free_bounds_horizontal(offsets_ver[0], epsilon))
-                if reachable_bottom.start in reachable_hor[i_p - 1][0]:
-                    reachable_hor[i_p][0] = reachable_bottom
+            starts, ends = free_hor[0][..., 0], free_hor[1][..., 0]
+            reachable = np.logical_and.accumulate(np.concatenate((
+                contains_array(starts[..., :1], ends[..., :1],
+                               offsets_hor[0]),
+                contains_array(starts[..., :-1], ends[..., :-1],
+                               starts[..., 1:])), axis=-1), axis=-1)
+            hor_start[..., 0] = np.where(reachable, starts, math.inf)
+            hor_end[..., 0] = np.where(reachable, ends, -math.inf)
         # left column
         if d_q > 0:
-            reachable_left = bounds_ver[0].cut(
-                start_cell.free_bounds_vertical(offsets_hor[0], epsilon))
-            if offsets_ver[0] in reachable_left:
-                reachable_ver[0][0] = reachable_left
-            for i_q in range(1, d_q):
-                cell = cells[start_i_p][start_i_q + i_q]
-                reachable_left = bounds_ver[i_q].cut(
-                    cell.free_bounds_vertical(offsets_hor[0], epsilon))
-                if reachable_left.start in reachable_ver[0][i_q - 1]:
-                    reachable_ver[0][i_q] = reachable_left
-        # all other rows and columns
-        for i_p in range(d_p):
-            for i_q in range(d_q):
-                cell = cells[start_i_p + i_p][start_i_q + i_q]
+            starts, ends = free_ver[0][..., 0, :], free_ver[1][..., 0, :]
+            reachable = np.logical_and.accumulate(np.concatenate((
+                contains_array(starts[..., :1], ends[..., :1],
+                               offsets_ver[0]),
+                contains_array(starts[..., :-1], ends[..., :-1],
+                               starts[..., 1:])), axis=-1), axis=-1)
+            ver_start[..., 0, :] = np.where(reachable, starts, math.inf)
+            ver_end[..., 0, :] = np.where(reachable, ends, -math.inf)
+
+        # all other rows and columns, by anti-diagonals: the borders of the
+        # cells (i_p|i_diagonal-i_p) are strided slices of the flattened
+        # arrays
+        flat_hor = [m.reshape(shape + (-1,)) for m in
+                    (hor_start, hor_end, free_hor[0], free_hor[1])]
+        flat_ver = [m.reshape(shape + (-1,)) for m in
+                    (ver_start, ver_end, free_ver[0], free_ver[1])]
+        flat_cells = cells.reshape(shape + (-1,))
+        bounds_ver = (bounds_ver[0][::-1], bounds_ver[1][::-1])
+        visited = np.zeros(shape, dtype=int)
+        n_diagonals = d_p + d_q - 1 if d_p > 0 and d_q > 0 else 0
+        for i_diagonal in range(n_diagonals):
+            start = max(0, i_diagonal - d_q + 1)
+            end = min(i_diagonal, d_p - 1) + 1
+            bottom, top, left, right = CellMatrix.diagonal_slices(
+                d_q, i_diagonal, start, end)
+
+            # cells with a reachable entry, that can be part of a traversal
+            active = flat_cells[..., left] & (
+                ~(flat_hor[1][..., bottom] < flat_hor[0][..., bottom]) |
+                ~(flat_ver[1][..., left] < flat_ver[0][..., left]))
+            i_active = np.flatnonzero(
+                active.reshape(-1, active.shape[-1]).any(axis=0))
+            if len(i_active) == 0:
+                # all following borders stay unreachable
+                break
+            visited += active.sum(axis=-1)
+
+            # only process the cells from the first to the last active one
+            start, end = start + i_active[0], start + i_active[-1] + 1
+            bottom, top, left, right = CellMatrix.diagonal_slices(
+                d_q, i_diagonal, start, end)
+            # bounds of the cells
+            cells_hor = slice(start, end)
+            cells_ver = slice(d_q - 1 - i_diagonal + start,
+                              d_q - 1 - i_diagonal + end)
+
+            CellMatrix.reachable_border(
+                flat_hor, bottom, top, flat_ver[0][..., left],
+                flat_ver[1][..., left],
+                bounds_hor[0][cells_hor], bounds_hor[1][cells_hor],
+                flat_cells[..., left])
+            CellMatrix.reachable_border(
+                flat_ver, left, right, flat_hor[0][..., bottom],
+                flat_hor[1][..., bottom],
+                bounds_ver[0][cells_ver], bounds_ver[1][cells_ver],
+                flat_cells[..., left])
+
+        return hor_start, hor_end, ver_start, ver_end, visited
 
-                reachable_left = reachable_ver[i_p][i_q]
-                reachable_bottom = reachable_hor[i_p][i_q]
+    @staticmethod
+    def diagonal_slices(d_q: int, i_diagonal: int, start: int, end: int) -> \
+            (slice, slice, slice, slice):
+        """
+        slices of the bottom & top borders (of the flattened hor arrays) and
+        of the left & right borders (of the flattened ver arrays) of the
+        cells (i_p|i_diagonal-i_p) for i_p in [start, end), the left slice
+        also selects these cells in flattened (d_p x d_q) arrays
+        """
+        bottom = slice(start * d_q + i_diagonal,
+                       (end - 1) * d_q + i_diagonal + 1, d_q)
+        top = slice(bottom.start + 1, bottom.stop + 1, d_q)
+        step_ver = max(d_q - 1, 1)
+        left = slice(start * (d_q - 1) + i_diagonal,
+                     (end - 1) * (d_q - 1) + i_diagonal + 1, step_ver)
+        right = slice(left.start + d_q, left.stop + d_q, step_ver)
+        return bottom, top, left, right
 
-                free_top = bounds_hor[i_p].cut(
-                    cell.free_bounds_horizontal(offsets_ver[i_q + 1], epsilon))
-                reachable_top = Bounds1D.nan()
-                if not reachable_left.is_nan():
-                    reachable_top = free_top
-                elif reachable_bottom.start <= free_top.end + tol:
-                    reachable_top = bounds_hor[i_p].cut(
-                        Bounds1D(max(reachable_bottom.start, free_top.start),
-                                 free_top.end))
-                reachable_hor[i_p][i_q + 1] = reachable_top
-
-                free_right = bounds_ver[i_q].cut(
-                    cell.free_bounds_vertical(offsets_hor[i_p + 1], epsilon))
-                reachable_right = Bounds1D.nan()
-                if not reachable_bottom.is_nan():
-                    reachable_right = free_right
-                elif reachable_left.start <= free_right.end + tol:
-                    reachable_right = bounds_ver[i_q].cut(
-                        Bounds1D(max(reachable_left.start, free_right.start),
-                                 free_right.end))
-                reachable_ver[i_p + 1][i_q] = reachable_right
-
-        '''if epsilon == 0.6170368168895033:  # DEBUG
-            print("A: " + str([str(p) for p in a_cm]))
-            print("B: " + str([str(p) for p in b_cm]))
-            print("start_i_p: " + str(start_i_p) + " bis end_i_p: " + \
-                  str(end_i_p))
-            print("start_i_q: " + str(start_i_q) + " bis end_i_q: " + \
-                  str(end_i_q))
-            print("d_p: " + str(d_p))
-            print("d_q: " + str(d_q))
-            print("reachable_hor: " + str([[str(b) for b in bs]
-                                           for bs in reachable_hor]))
-            print("reachable_ver: " + str([[str(b) for b in bs]
-                                           for bs in reachable_ver]))
-            print("offsets_hor: " + str([str(offset)
-                                         for offset in offsets_hor]))
-            print("offsets_ver: " + str([str(offset)
-                                         for offset in offsets_ver]))
-            print("bounds_hor: " + str([str(bound) for bound in bounds_hor]))
-            print("bounds_ver: " + str([str(bound) for bound in bounds_ver]))
-            print("==============")'''
+    @staticmethod
+    def reachable_border(flat: [np.ndarray], entry: slice, exit: slice,
+                         other_start: np.ndarray, other_end: np.ndarray,
+                         bounds_start: np.ndarray, bounds_end: np.ndarray,
+                         cells: np.ndarray):
+        """
+        reachable space on the exit borders (top or right) of cells, given
+        the reachable space on their entry borders (bottom or left) and on
+        their other entry borders (left or bottom)
+        flat: flattened (reachable start, reachable end, free start,
+        free end)
+        cells: cells that can be part of a traversal, the exits of all
+        others stay unreachable
+        """
+        reachable_start, reachable_end, free_start, free_end = flat
+        entry_start = reachable_start[..., entry]
+        free_exit_start = free_start[..., exit]
+        free_exit_end = free_end[..., exit]
+
+        # entered through the other border: all free space is reachable,
+        # entered through the opposite border: only monotone
+        other = ~(other_end < other_start)
+        from_entry = ~other & (entry_start <= free_exit_end + tol) & cells
+        other &= cells
+        cut_start, cut_end = cut_array(
+            bounds_start, bounds_end,
+            np.maximum(entry_start, free_exit_start), free_exit_end)
+        reachable_start[..., exit] = np.where(
+            other, free_exit_start,
+            np.where(from_entry, cut_start, math.inf))
+        reachable_end[..., exit] = np.where(
+            other, free_exit_end,
+            np.where(from_entry, cut_end, -math.inf))
 
+    def generate_reachable_freespace(
+            self, a_cm: CM_Point, b_cm: CM_Point, epsilon: float) -> \
+            ([[Bounds1D]], [[Bounds1D]]):
+        """
+            Returns two matrices: reachable_hor and reachable_ver
+            For all cells (i_p|i_q), the matrices describe the reachable space
+            (given epsilon) for the bottom and left border.
+        """
+        a = a_cm[0]
+        b = b_cm[0]
+
+        if a == b or not a < b:
+            return [], []
+
+        space = self.reachable_space(a_cm, b_cm, epsilon)
+        hor_start, hor_end = space.hor
+        ver_start, ver_end = space.ver
+
+        reachable_hor = [[Bounds1D(start, end) for start, end in zip(*row)]
+                         for row in zip(hor_start.tolist(), hor_end.tolist())]
+        reachable_ver = [[Bounds1D(start, end) for start, end in zip(*row)]
+                         for row in zip(ver_start.tolist(), ver_end.tolist())]
         return reachable_hor, reachable_ver
 
     def decide_traversal(
             self, a_cm: CM_Point, b_cm: CM_Point, epsilon: float) -> bool:
+        """
+            Decides if b is reachable from a, with a cached reachable space
+            containing a and b if there is one. Otherwise the reachable space
+            from a is propagated and cached, if the bounds_l of the cells do
+            not decide already.
+        """
         a = a_cm[0]
         b = b_cm[0]
+        self.visited_cells = np.zeros(1, dtype=int)
 
         if a == b:
             return True
         if not a < b:
             return False
 
-        (reachable_hor, reachable_ver) = self \
-            .generate_reachable_freespace(a_cm, b_cm, epsilon)
+        decision = self.reachable_cache.decide(a_cm, b_cm, epsilon)
+        if decision is not None:
+            return decision
+
+        decisions, undecided, _ = self.decide_by_bounds(
+            a_cm, b_cm, np.array([epsilon]))
+        if not undecided[0]:
+            return bool(decisions[0])
 
-        if len(reachable_hor) == 0:
-            return b.y in reachable_ver[-1][-1]
-        if len(reachable_ver[0]) == 0:
-            return b.x in reachable_hor[-1][-1]
+        space = self.reachable_space(a_cm, b_cm, epsilon)
+        self.visited_cells = np.reshape(self.visited_cells, 1)
+        return space.reachable(b)
 
-        return (b.x in reachable_hor[-1][-1]) or (b.y in reachable_ver[-1][-1])
+    def decide_traversal_many(
+            self, a_cm: CM_Point, b_cm: CM_Point, epsilons: [float]) -> \
+            np.ndarray:
+        """
+            Decides for all epsilons at once, if b is reachable from a.
+            The reachable space is propagated for all epsilons in one pass
+            over the cells (in batches of at most batch_cells cells times
+            epsilons).
+            Epsilons are decided from the bounds_l of the cells alone, if
+            all cells are free or if no chain of cells with free space
+            connects a and b. Otherwise only the cells of such chains are
+            visited. The number of visited cells per epsilon is kept in
+            self.visited_cells.
+        """
+        a = a_cm[0]
+        b = b_cm[0]
+        epsilons = np.asarray(epsilons, dtype=np.float64)
+        self.visited_cells = np.zeros(len(epsilons), dtype=int)
+
+        if a == b:
+            return np.ones(len(epsilons), dtype=bool)
+        if not a < b:
+            return np.zeros(len(epsilons), dtype=bool)
+
+        n_cells = (abs(b_cm[1][0] - a_cm[1][0]) + 2) * \
+            (abs(b_cm[1][1] - a_cm[1][1]) + 2)
+        n_batch = max(1, batch_cells // n_cells)
+
+        decisions = []
+        visited = []
+        for i_batch in range(0, len(epsilons), n_batch):
+            decisions_batch, visited_batch = self.decide_traversal_batch(
+                a_cm, b_cm, epsilons[i_batch:i_batch + n_batch])
+            decisions.append(decisions_batch)
+            visited.append(visited_batch)
+        self.visited_cells = np.concatenate(visited)
+        return np.concatenate(decisions)
+
+    def decide_traversal_batch(
+            self, a_cm: CM_Point, b_cm: CM_Point, epsilons: np.ndarray) -> \
+            (np.ndarray, np.ndarray):
+        # decisions and visited cells for one batch of decide_traversal_many
+        b = b_cm[0]
+        visited = np.zeros(len(epsilons), dtype=int)
+        decisions, undecided, cells = self.decide_by_bounds(
+            a_cm, b_cm, epsilons)
+        if not undecided.any():
+            return decisions, visited
+
+        hor_start, hor_end, ver_start, ver_end = self.reachable_freespace(
+            a_cm, b_cm, epsilons[undecided], cells=cells)
+        visited[undecided] = self.visited_cells
+
+        if hor_start.shape[-2] == 0:
+            decisions[undecided] = contains_array(
+                ver_start[..., -1, -1], ver_end[..., -1, -1], b.y)
+        elif ver_start.shape[-1] == 0:
+            decisions[undecided] = contains_array(
+                hor_start[..., -1, -1], hor_end[..., -1, -1], b.x)
+        else:
+            decisions[undecided] = \
+                contains_array(hor_start[..., -1, -1],
+                               hor_end[..., -1, -1], b.x) | \
+                contains_array(ver_start[..., -1, -1],
+                               ver_end[..., -1, -1], b.y)
+        return decisions, visited
+
+    def smallest_reachable(self, a_cm: CM_Point, b_cm: CM_Point,
+                           epsilons: [float], i_start_epsilon: int,
+                           i_end_epsilon: int) -> int:
+        """
+        index of the smallest of the sorted epsilons in
+        [i_start_epsilon, i_end_epsilon) for which b is reachable from a,
+        i_end_epsilon if there is none.
+        k-ary search: every pass decides search_arity evenly spaced
+        epsilons at once.
+        """
+        while i_start_epsilon < i_end_epsilon:
+            n = i_end_epsilon - i_start_epsilon
+            i_probes = sorted(set(
+                i_start_epsilon + (n * k) // (search_arity + 1)
+                for k in range(search_arity + 1)) - {i_end_epsilon})
+            decisions = self.decide_traversal_many(
+                a_cm, b_cm, [epsilons[i] for i in i_probes])
+
+            # first reachable probe bounds the search from above, the last
+            # unreachable probe before it from below
+            i_end = len(i_probes)
+            if decisions.any():
+                i_end = int(np.argmax(decisions))
+                i_end_epsilon = i_probes[i_end]
+            if i_end > 0:
+                i_start_epsilon = i_probes[i_end - 1] + 1
+        return i_end_epsilon
+
+    def decide_by_bounds(
+            self, a_cm: CM_Point, b_cm: CM_Point, epsilons: np.ndarray) -> \
+            (np.ndarray, np.ndarray, np.ndarray):
+        """
+            Decides from the bounds_l of the cells between a and b alone: b
+            is reachable if all cells are free, and not if no chain of cells
+            with free space connects a and b.
+            Returns the decisions, the undecided epsilons and for these the
+            cells on such chains (None if there are no cells).
+        """
+        _, _, i_ps_border, i_qs_border = self.reachable_region(a_cm, b_cm)
+        i_ps = i_ps_border[1:]
+        i_qs = i_qs_border[1:]
+        decisions = np.zeros(len(epsilons), dtype=bool)
+        undecided = np.ones(len(epsilons), dtype=bool)
+        cells = None
+        if len(i_ps) > 0 and len(i_qs) > 0:
+            # all cells free: b is reachable
+            upper = self.cell_store.bounds_l_end[np.ix_(i_ps, i_qs)].max()
+            decisions = upper <= epsilons - self.prune_slack(epsilons)
+            # chains of cells with free space from a to b
+            cells = self.open_cells(epsilons, i_ps, i_qs)
+            cells = self.coarse_reachable(cells) & self.coarse_reachable(
+                cells[..., ::-1, ::-1])[..., ::-1, ::-1]
+            undecided = ~decisions & cells[..., -1, -1]
+            cells = cells[undecided]
+        return decisions, undecided, cells
 
     def steepest_descent_hyperbola(self, a_cm: CM_Point, direction: int) -> \
             Hyperbola:
@@ -1645,6 +3068,102 @@ class CellMatrix:
 
         return paths_1
 
+    @staticmethod
+    def best_paths_through_graph(
+            graph: {}, use_sqslope2: bool = False,
+            max_paths: int = max_best_paths) -> [([int], (float, float))]:
+        """
+        Best paths through the graph from generate_traversal_graph, like
+        best_paths(paths_through_graph(graph)), but without enumerating all
+        paths: the graph is monotone (a DAG), so the smallest reci_sqslope
+        (and sqslope2 if use_sqslope2) to every vertex is found by dynamic
+        programming in topological order, keeping all tied predecessors.
+        Returns at most max_paths of the tied paths.
+        If no path has a finite reci_sqslope, all paths are tied.
+        """
+        start = 0
+        goal = max(graph, key=int)
+
+        def rels_sorted(vertex: int):
+            # paths end at goal
+            if vertex == goal:
+                return iter([])
+            return iter(sorted(graph[vertex], key=lambda rel: rel[0]))
+
+        # topological order of the vertices reachable from start (depth
+        # first, edges back to a vertex on the stack are ignored)
+        order = []
+        edges = {start: []}
+        on_stack = {start}
+        stack = [(start, rels_sorted(start))]
+        while stack:
+            vertex, rels = stack[-1]
+            rel = next(rels, None)
+            if rel is None:
+                stack.pop()
+                on_stack.discard(vertex)
+                order.append(vertex)
+                continue
+            next_vertex = rel[0]
+            if next_vertex in on_stack:
+                continue
+            edges[vertex].append(rel)
+            if next_vertex not in edges:
+                edges[next_vertex] = []
+                on_stack.add(next_vertex)
+                stack.append((next_vertex, rels_sorted(next_vertex)))
+        order.reverse()
+
+        # smallest slopes to all vertices and their tied predecessors
+        slopes = {start: (0, 0)}
+        predecessors = {start: []}
+        incoming = {start: []}
+        for vertex in order:
+            for next_vertex, edge_slopes in edges[vertex]:
+                next_slopes = (slopes[vertex][0] + edge_slopes[0],
+                               slopes[vertex][1] + edge_slopes[1])
+                incoming.setdefault(next_vertex, []).append(
+                    (vertex, edge_slopes))
+                comparison = 1 if next_vertex not in slopes else \
+                    CellMatrix.compare_slopes(slopes[next_vertex],
+                                              next_slopes, use_sqslope2)
+                if comparison > 0:
+                    slopes[next_vertex] = next_slopes
+                    predecessors[next_vertex] = [(vertex, edge_slopes)]
+                elif comparison == 0:
+                    predecessors[next_vertex].append((vertex, edge_slopes))
+
+        if goal not in slopes:
+            return []
+        if slopes[goal][0] == math.inf:
+            predecessors = incoming
+
+        # tied paths, backwards from goal
+        paths = []
+        stack = [(goal, [goal], (0, 0))]
+        while stack and len(paths) < max_paths:
+            vertex, path, path_slopes = stack.pop()
+            if vertex == start:
+                paths.append((path[::-1], path_slopes))
+                continue
+            for previous, edge_slopes in reversed(predecessors[vertex]):
+                stack.append((previous, path + [previous],
+                              (edge_slopes[0] + path_slopes[0],
+                               edge_slopes[1] + path_slopes[1])))
+        return paths
+
+    @staticmethod
+    def compare_slopes(slopes1: (float, float), slopes2: (float, float),
+                       use_sqslope2: bool) -> int:
+        """
+        1 if slopes2 are smaller than slopes1, 0 if they are about equal,
+        -1 if they are larger
+        """
+        for i in range(2 if use_sqslope2 else 1):
+            if not about_equal(slopes1[i], slopes2[i]):
+                return 1 if slopes2[i] < slopes1[i] else -1
+        return 0
+
     def best_paths_through_ces(
             self, a_cm: CM_Point, b_cm: CM_Point, traversals: [Traversal],
             epsilon: float) -> ([([int], (float, float))], [Traversal]):
@@ -1656,11 +3175,8 @@ class CellMatrix:
         # 1) generate_traversal_graph
         graph, traversals = self.generate_traversal_graph(a_cm, b_cm, traversals, epsilon)
 
-        # 2) find all paths through graph
-        all_paths = self.paths_through_graph(graph)
-
-        # 3) filter for best paths (using reci_sqslope and sqslope2)
-        best_paths = self.best_paths(all_paths)
+        # 2) find the best paths through graph (using reci_sqslope)
+        best_paths = self.best_paths_through_graph(graph)
 
         return best_paths, traversals
 
@@ -1769,8 +3285,7 @@ class CellMatrix:
         return epsilon
 
     def do_traverse(self) -> (float, [Traversal]):
-        traversals = self.traverse_recursive(self.a_cm, self.critical_events,
-                                             self.b_cm)
+        traversals = list(self.generate_traversals(self.max_traversals))
         # assert len(traversals) > 0, \
         #    "Error: No Traversal was found !!? Traversals: " + str(traversals)
         if len(traversals) > 0:
@@ -1778,9 +3293,149 @@ class CellMatrix:
         else:
             return 0, []
 
+    def generate_traversals(self, max_traversals: int = None):
+        """
+        Generates the traversals from a to b lazily, without geometrically
+        identical duplicates, at most max_traversals (all if None).
+        No work is done for traversals that are not consumed.
+        """
+        if max_traversals == 0:
+            return
+        keys = set()
+        traversals = self.iter_traversals(self.a_cm, self.critical_events,
+                                          self.b_cm)
+        for traversal in traversals:
+            key = traversal.key()
+            if key in keys:
+                continue
+            keys.add(key)
+            yield traversal
+            # stop before the next traversal is pulled (and calculated)
+            if len(keys) == max_traversals:
+                return
+
     def traverse_recursive(
             self, a_cm: CM_Point, critical_events: CriticalEvents,
             b_cm: CM_Point) -> [Traversal]:
+        return list(self.iter_traversals(a_cm, critical_events, b_cm))
+
+    def iter_traversals(
+            self, a_cm: CM_Point, critical_events: CriticalEvents,
+            b_cm: CM_Point):
+        """
+        Generates the traversals from a to b (like traverse_recursive) lazily,
+        sub-traversals are only calculated when they are needed.
+        """
+        return self.run_tasks(self.subproblem_traversals(
+            a_cm, critical_events, b_cm).pull())
+
+    def run_tasks(self, task):
+        """
+        Generates the traversals of a task. A task is a generator that
+        yields a Traversal to emit it, or another task to pull the next
+        traversal of that task (sent back, LazyList.end once the task is
+        exhausted), or a LazyList to pull from its iterator. Tasks run on an
+        explicit work stack, so nested subproblems do not grow the call
+        stack.
+        """
+        stack = [task]
+        # innermost subproblem (name of the LazyList) of every task
+        subproblems = [None]
+        value = None
+        try:
+            while stack:
+                self.peak_stack_depth = max(self.peak_stack_depth, len(stack))
+                try:
+                    item = stack[-1].send(value)
+                except StopIteration:
+                    stack.pop()
+                    subproblems.pop()
+                    value = LazyList.end
+                    continue
+
+                if not isinstance(item, Traversal):
+                    # pull from a subtask
+                    if len(stack) == max_stack_depth:
+                        raise TraversalCycleError(
+                            "Error: more than " + str(max_stack_depth) +
+                            " tasks on the traversal work stack, in "
+                            "subproblem " + str(subproblems[-1]))
+                    if isinstance(item, LazyList):
+                        subproblems.append(item.name or subproblems[-1])
+                        item = item.iterator
+                    else:
+                        subproblems.append(subproblems[-1])
+                    stack.append(item)
+                    value = None
+                elif len(stack) > 1:
+                    # pass traversal to the pulling task
+                    stack.pop()
+                    subproblems.pop()
+                    value = item
+                else:
+                    yield item
+                    value = None
+        finally:
+            # stopped early or failed: close the tasks that are still
+            # running, memoized ones are marked as abandoned
+            for task in reversed(stack):
+                task.close()
+
+    @staticmethod
+    def subproblem_key(a_cm: CM_Point, critical_events: CriticalEvents,
+                       b_cm: CM_Point) -> tuple:
+        # points are snapped like in Traversal.key
+        a = a_cm[0]
+        b = b_cm[0]
+        return ((round(a.x, 9), round(a.y, 9)), a_cm[1],
+                (round(b.x, 9), round(b.y, 9)), b_cm[1],
+                critical_events.fingerprint())
+
+    def subproblem_traversals(
+            self, a_cm: CM_Point, critical_events: CriticalEvents,
+            b_cm: CM_Point, concurrent: bool = False) -> LazyList:
+        """
+        Traversals from a to b (of traversal_task). Every subproblem is
+        solved once per cell matrix, later calls replay its traversals.
+        With an executor, a concurrent subproblem (independent of the ones
+        solved meanwhile) is submitted to it right away.
+        """
+        key = self.subproblem_key(a_cm, critical_events, b_cm)
+        traversals = self.subproblem_memo.get(key)
+        if traversals is None or traversals.abandoned:
+            self.memo_misses += 1
+            if concurrent and self.executor is not None:
+                task = self.future_task(self.executor.submit(
+                    solve_subproblem,
+                    [point.to_tuple() for point in self.p.points],
+                    [point.to_tuple() for point in self.q.points],
+                    (a_cm[0].to_tuple(), a_cm[1]),
+                    [traversal.to_tuple()
+                     for traversal in critical_events.list()],
+                    (b_cm[0].to_tuple(), b_cm[1])))
+            else:
+                task = self.traversal_task(a_cm, critical_events, b_cm)
+            traversals = LazyList(task, name="from " + str(a_cm[0]) +
+                                  " to " + str(b_cm[0]))
+            self.subproblem_memo[key] = traversals
+        else:
+            self.memo_hits += 1
+        return traversals
+
+    def future_task(self, future: Future):
+        """
+        Task (see run_tasks) of the traversals solved by the executor, in
+        the order of the serial solution.
+        """
+        for t in future.result():
+            yield Traversal.from_tuple(self, t)
+
+    def traversal_task(
+            self, a_cm: CM_Point, critical_events: CriticalEvents,
+            b_cm: CM_Point):
+        """
+        Task (see run_tasks) of the traversals from a to b.
+        """
 
         print("===========================================================")
 
@@ -1790,6 +3445,8 @@ class CellMatrix:
         print("===0===traverse_recursive=== a:", a, " b:", b)
         print("---0---critical_events--- ", critical_events)
 
+        self.subproblems += 1
+
         cc_a = a_cm[1]
         cc_b = b_cm[1]
 
@@ -1798,7 +3455,8 @@ class CellMatrix:
         max_ab_epsilon = max(a_epsilon, b_epsilon)
 
         if a == b:
-            return [Traversal.nan()]
+            yield Traversal.nan()
+            return
 
         # done: just connect a and b vertical or horizontal
         if (about_equal(a.x, b.x) or about_equal(a.y, b.y) or
@@ -1816,7 +3474,8 @@ class CellMatrix:
                 for i_p in range(cc_a[0] + 1, cc_b[0] + 1):
                     points.append(Vector(self.p.offsets[i_p], y))
                 points.append(Vector(b.x, y))
-            return [self.traversal_from_points(points)]
+            yield self.traversal_from_points(points)
+            return
 
         critical_event = critical_events.critical(self, a_cm, b_cm)
         print("===1===critical_event=== ", critical_event)
@@ -1964,16 +3623,22 @@ class CellMatrix:
                     traversal_a.set_sqslopes2([b_hyperbola.f2aax(),
                                                b_hyperbola.f2aax()])
                 if a == a2 and b == b2:
-                    return [Traversal(
+                    yield Traversal(
                         self, a_cm, b_cm, [a, b], max(a_epsilon, b_epsilon),
-                        [a_epsilon, b_epsilon])]
+                        [a_epsilon, b_epsilon])
+                    return
 
                 new_critical_events = critical_events.in_and_on_bounds_1(a2, b2)
-                rec_traversals = self.traverse_recursive(a2_cm, new_critical_events, b2_cm)
-                for rec_traversal in rec_traversals:
-                    traversals.append(traversal_a + rec_traversal + traversal_b)
+                rec_traversals = self.subproblem_traversals(
+                    a2_cm, new_critical_events, b2_cm).pull()
+                while True:
+                    rec_traversal = yield rec_traversals
+                    if rec_traversal is LazyList.end:
+                        break
+                    traversals.append(rec_traversal)
+                    yield traversal_a + rec_traversal + traversal_b
                 if len(traversals) > 0:
-                    return traversals
+                    return
 
             # check for critical events
             # old type
@@ -1987,7 +3652,8 @@ class CellMatrix:
                 # vertical
                 border_hyperbolas = []
                 for i in range(cc_a[1], cc_b[1] + 1):
-                    border_hyperbolas.append(self.cells[cc_a[0]][i].hyperbola_top)
+                    border_hyperbolas.append(
+                        self.cell_store.hyperbola_hor(cc_a[0], i + 1))
                 if not about_equal(a.x, a2.x):
                     criticals = steepest_descent_helper_new_type_critical_1(
                         a_bounds_hor, a_hyperbola_hor, border_hyperbolas, 1)
@@ -2017,8 +3683,8 @@ class CellMatrix:
                 # horizontal
                 border_hyperbolas = []
                 for i in range(cc_a[0], cc_b[0] + 1):
-                    border_hyperbolas.append(self.cells[i][cc_a[1]]
-                                             .hyperbola_right)
+                    border_hyperbolas.append(
+                        self.cell_store.hyperbola_ver(i + 1, cc_a[1]))
                 if not about_equal(a.y, a2.y):
                     criticals = steepest_descent_helper_new_type_critical_1(
                         a_bounds_ver, a_hyperbola_ver, border_hyperbolas, 1)
@@ -2050,7 +3716,8 @@ class CellMatrix:
                 # vertical
                 border_hyperbolas = []
                 for i in range(cc_b[1], cc_a[1] - 1, -1):
-                    border_hyperbolas.append(self.cells[cc_b[0]][i].hyperbola_bottom)
+                    border_hyperbolas.append(
+                        self.cell_store.hyperbola_hor(cc_b[0], i))
                 if not about_equal(b.x, b2.x):
                     criticals = steepest_descent_helper_new_type_critical_1(
                         b_bounds_hor, b_hyperbola_hor, border_hyperbolas, -1)
@@ -2081,8 +3748,8 @@ class CellMatrix:
                 # horizontal
                 border_hyperbolas = []
                 for i in range(cc_b[0], cc_a[0] - 1, -1):
-                    border_hyperbolas.append(self.cells[i][cc_b[1]]
-                                             .hyperbola_left)
+                    border_hyperbolas.append(
+                        self.cell_store.hyperbola_ver(i, cc_b[1]))
                 if not about_equal(b.y, b2.y):
                     criticals = steepest_descent_helper_new_type_critical_1(
                         b_bounds_ver, b_hyperbola_ver, border_hyperbolas, -1)
@@ -2155,11 +3822,16 @@ class CellMatrix:
                         # traverse it
                         a4_cm = critical_traversal.a_cm
                         b4_cm = critical_traversal.b_cm
-                        traversals_a3_a4 = self.traverse_recursive(a3_cm, critical_events_in_bounds, a4_cm)
-                        traversals_b4_b3 = self.traverse_recursive(b4_cm, critical_events_in_bounds, b3_cm)
-                        return [traversal_a_a3 + traversal_a3_a4 + critical_traversal + traversal_b4_b3 +
-                                traversal_b3_b for traversal_a3_a4 in traversals_a3_a4
-                                for traversal_b4_b3 in traversals_b4_b3]
+                        traversals_a3_a4 = self.subproblem_traversals(
+                            a3_cm, critical_events_in_bounds, a4_cm)
+                        traversals_b4_b3 = self.subproblem_traversals(
+                            b4_cm, critical_events_in_bounds, b3_cm,
+                            concurrent=True)
+                        yield from concatenations(
+                            [[traversal_a_a3], traversals_a3_a4,
+                             [critical_traversal], traversals_b4_b3,
+                             [traversal_b3_b]])
+                        return
                     else:
                         # else skip
                         continue
@@ -2170,14 +3842,20 @@ class CellMatrix:
                     a3_cm, b3_cm, critical_traversals.copy(), critical_epsilon)
                 print("BEST PATHS: ", best_paths)
 
-                traversals_a3_b3 = self.traverse_best_paths(best_paths, ces, critical_epsilon,
-                                                            critical_events_in_bounds)
+                traversals_a3_b3 = self.best_paths_task(
+                    best_paths, ces, critical_epsilon,
+                    critical_events_in_bounds)
 
-                traversals = [traversal_a_a3 + traversal_a3_b3 + traversal_b3_b
-                              for traversal_a3_b3 in traversals_a3_b3]
+                traversals = []
+                while True:
+                    traversal_a3_b3 = yield traversals_a3_b3
+                    if traversal_a3_b3 is LazyList.end:
+                        break
+                    traversals.append(traversal_a3_b3)
+                    yield traversal_a_a3 + traversal_a3_b3 + traversal_b3_b
 
                 if len(traversals) > 0:
-                    return traversals
+                    return
 
         # critical event is higher than max_ab_epsilon
         print("=== higher ===")
@@ -2190,48 +3868,78 @@ class CellMatrix:
             a_cm, b_cm, critical_traversals.copy(), critical_epsilon)
         print("BEST PATHS: ", best_paths)
 
-        traversals = self.traverse_best_paths(best_paths, ces, critical_epsilon, critical_events)
+        traversals = self.best_paths_task(best_paths, ces, critical_epsilon,
+                                          critical_events)
 
-        if len(traversals) > 0:
-            return traversals
-        else:
-            return [Traversal.nan()]
+        found = False
+        while True:
+            traversal = yield traversals
+            if traversal is LazyList.end:
+                break
+            found = True
+            yield traversal
+        if not found:
+            yield Traversal.nan()
 
     def traverse_best_paths(self, best_paths, ces: [Traversal], critical_epsilon: float,
                             critical_events: CriticalEvents) -> [Traversal]:
-        traversals = []
-        # for all paths
-        for i, path in enumerate(best_paths):
-            # for all critical traversals on path
-            path_traversals = [ces[0]]  # traversals for given path
-            last_b_cm = ces[0].b_cm
-            for ce_i in path[0][1::]:
-                # traverse to ce
-                ce = ces[ce_i]
-                # get critical events inbetween, ignoring critical events >= the current critical epsilon
-                bound_epsilon = Bounds1D(0, critical_epsilon)
-                ces_in_between = critical_events.in_bounds(last_b_cm[0], ce.a_cm[0]) \
-                    .in_epsilon_bound(bound_epsilon) \
-                    .remove_epsilon(critical_epsilon)
-                traversals_to_ce = self.traverse_recursive(
-                    last_b_cm, ces_in_between, ce.a_cm)
-
-                # traverse to ce and traverse ce
-                # if ce is goal, skip ce
-                if ce_i == len(ces) - 1:
-                    traversals_to_ce_and_ce = traversals_to_ce
-                else:
-                    traversals_to_ce_and_ce = [traversal_to_ce + ce for traversal_to_ce in traversals_to_ce]
-
-                # combine with path traversals up to this point
-                path_traversals = [path_traversal + traversal_to_ce_and_ce
-                                   for path_traversal in path_traversals
-                                   for traversal_to_ce_and_ce in traversals_to_ce_and_ce]
-                last_b_cm = ce.b_cm
+        return list(self.iter_best_paths(best_paths, ces, critical_epsilon,
+                                         critical_events))
 
-            traversals += path_traversals
+    def iter_best_paths(self, best_paths, ces: [Traversal], critical_epsilon: float,
+                        critical_events: CriticalEvents):
+        """
+        Generates the traversals along the best paths (like
+        traverse_best_paths) lazily: the combinations of the traversals
+        between the critical events of a path are built one at a time, the
+        traversals of every part only once.
+        """
+        return self.run_tasks(self.best_paths_task(
+            best_paths, ces, critical_epsilon, critical_events))
 
-        return traversals
+    def best_paths_task(self, best_paths, ces: [Traversal],
+                        critical_epsilon: float,
+                        critical_events: CriticalEvents):
+        """
+        Task (see run_tasks) of the traversals along the best paths.
+        """
+        # for all paths, the parts (and the subproblems submitted to the
+        # executor) of a path are only built once the path is reached
+        for path in best_paths:
+            parts = self.path_parts(path, ces, critical_epsilon,
+                                    critical_events)
+            # combine the parts of the path
+            yield from concatenations(parts)
+
+    def path_parts(self, path, ces: [Traversal], critical_epsilon: float,
+                   critical_events: CriticalEvents) -> []:
+        """
+        parts of a best path (see concatenations): the traversals to and
+        through its critical events
+        """
+        # for all critical traversals on path
+        parts = [[ces[0]]]  # traversals for given path, by part
+        last_b_cm = ces[0].b_cm
+        for ce_i in path[0][1::]:
+            # traverse to ce
+            ce = ces[ce_i]
+            # get critical events inbetween, ignoring critical events >= the current critical epsilon
+            bound_epsilon = Bounds1D(0, critical_epsilon)
+            ces_in_between = critical_events.in_bounds(last_b_cm[0], ce.a_cm[0]) \
+                .in_epsilon_bound(bound_epsilon) \
+                .remove_epsilon(critical_epsilon)
+            traversals_to_ce = self.subproblem_traversals(
+                last_b_cm, ces_in_between, ce.a_cm, concurrent=True)
+
+            # traverse to ce and traverse ce
+            # if ce is goal, skip ce
+            if ce_i == len(ces) - 1:
+                parts.append(traversals_to_ce)
+            else:
+                parts.append(LazyList(concatenations(
+                    [traversals_to_ce, [ce]])))
+            last_b_cm = ce.b_cm
+        return parts
 
     def sample_l(self, n_l: int, n_p: int, heatmap_n: int = 100,
                  traversals_n: int = 10, cross_sections_n: int = 100) -> {}:
@@ -2515,3 +4223,237 @@ class CellMatrix:
         sample["traversal-3d-l"] = [x_l, y_l, z_l]
 
         return sample
+
+
+def remove_consecutive_equals(points: [Vector]) -> [Vector]:
+    """ points without consecutive equal points, CellMatrix needs those """
+    return [point for i, point in enumerate(points)
+            if i == 0 or point != points[i - 1]]
+
+
+def frechet_distance(points_p: [Vector], points_q: [Vector]) -> float:
+    """
+    Frechet distance of p and q, without traversing the cell matrix
+    """
+    return CellMatrix(points_p, points_q, traverse=0).frechet_distance()
+
+
+class ThresholdDecider:
+    """
+    Decides dF(p, q) <= epsilon for many pairs of curves. Cheap filters
+    accept or reject most pairs, in this order: the distances of the
+    endpoints and the bounding boxes of the curves. Only the remaining
+    pairs are decided on the free space (CellMatrix.decide_traversal).
+    hits counts the pairs decided by every filter.
+    """
+    filters = ("endpoints", "bounding-box", "free-space")
+
+    def __init__(self, epsilon: float):
+        self.epsilon = epsilon
+        # bounds above epsilon + slack reject, as the free space would
+        self.reject_above = epsilon + slack(epsilon)
+        self.pairs = 0
+        self.hits = dict.fromkeys(ThresholdDecider.filters, 0)
+
+    def decide_many(self, pairs: [([Vector], [Vector])]):
+        """ generates the decisions for the pairs (p, q) """
+        for points_p, points_q in pairs:
+            yield self.decide(points_p, points_q)
+
+    def decide(self, points_p: [Vector], points_q: [Vector]) -> bool:
+        points_p = remove_consecutive_equals(points_p)
+        points_q = remove_consecutive_equals(points_q)
+        for name, decision in (("endpoints", self.decide_endpoints),
+                               ("bounding-box", self.decide_bounding_box),
+                               ("free-space", self.decide_free_space)):
+            decided = decision(points_p, points_q)
+            if decided is not None:
+                # counted once decided, so the hit rates add up to 1
+                self.pairs += 1
+                self.hits[name] += 1
+                return decided
+
+    def hit_rates(self) -> {}:
+        """ share of the pairs decided by every filter """
+        return {name: hits / max(self.pairs, 1)
+                for name, hits in self.hits.items()}
+
+    def decide_endpoints(self, points_p: [Vector],
+                         points_q: [Vector]) -> bool:
+        # a traversal starts and ends at the endpoints
+        if points_p[0].d(points_q[0]) > self.reject_above or \
+                points_p[-1].d(points_q[-1]) > self.reject_above:
+            return False
+        return None
+
+    def decide_bounding_box(self, points_p: [Vector],
+                            points_q: [Vector]) -> bool:
+        xys_p = np.array([point.to_tuple() for point in points_p])
+        xys_q = np.array([point.to_tuple() for point in points_q])
+        min_p, max_p = xys_p.min(axis=0), xys_p.max(axis=0)
+        min_q, max_q = xys_q.min(axis=0), xys_q.max(axis=0)
+
+        # all points of the boxes within epsilon: everything is free
+        d_max = np.maximum(max_p - min_q, max_q - min_p)
+        if math.hypot(*d_max) <= self.epsilon:
+            return True
+        # a vertex further than epsilon from the box of the other curve
+        # can not be matched
+        for xys, min_box, max_box in ((xys_p, min_q, max_q),
+                                      (xys_q, min_p, max_p)):
+            d = np.maximum(np.maximum(min_box - xys, xys - max_box), 0)
+            if np.hypot(d[:, 0], d[:, 1]).max() > self.reject_above:
+                return False
+        return None
+
+    def decide_free_space(self, points_p: [Vector],
+                          points_q: [Vector]) -> bool:
+        cell_matrix = CellMatrix(points_p, points_q, traverse=0)
+        return cell_matrix.decide_traversal(cell_matrix.a_cm,
+                                            cell_matrix.b_cm, self.epsilon)
+
+
+# cell matrix of the last curves of a worker thread / process of an executor
+worker_state = threading.local()
+
+
+def solve_subproblem(points_p: [(float, float)], points_q: [(float, float)],
+                     a_cm: tuple, critical_events: [tuple],
+                     b_cm: tuple) -> [tuple]:
+    """
+    Traversals from a to b for the executor of a cell matrix, everything is
+    passed as tuples (see Traversal.to_tuple). The cell matrix of the curves
+    is kept by the worker for the next subproblem.
+    """
+    curves = (points_p, points_q)
+    if getattr(worker_state, "curves", None) != curves:
+        worker_state.cell_matrix = CellMatrix(
+            [Vector.from_tuple(point) for point in points_p],
+            [Vector.from_tuple(point) for point in points_q], traverse=0)
+        worker_state.curves = curves
+    cell_matrix = worker_state.cell_matrix
+
+    events = CriticalEvents()
+    for t in critical_events:
+        events.append(Traversal.from_tuple(cell_matrix, t))
+    traversals = cell_matrix.iter_traversals(
+        (Vector.from_tuple(a_cm[0]), a_cm[1]), events,
+        (Vector.from_tuple(b_cm[0]), b_cm[1]))
+    return [traversal.to_tuple() for traversal in traversals]
+
+
+def pack_curves(curves: []) -> (np.ndarray, np.ndarray):
+    """
+    curves (lists of Vectors or n x 2 arrays) as one n x 2 array of all
+    their points and the offsets of the curves in it
+    """
+    arrays = [np.asarray([point.to_tuple() for point in curve]
+                         if len(curve) > 0 and isinstance(curve[0], Vector)
+                         else curve, dtype=np.float64).reshape(-1, 2)
+              for curve in curves]
+    offsets = np.cumsum([0] + [len(xys) for xys in arrays])
+    if len(arrays) == 0:
+        return np.zeros((0, 2)), offsets
+    return np.concatenate(arrays), offsets
+
+
+def unpack_curves(xys: np.ndarray, offsets: np.ndarray) -> [[Vector]]:
+    """
+    curves of pack_curves as lists of Vectors, without consecutive equal
+    points
+    """
+    return [remove_consecutive_equals(
+                [Vector(x, y) for x, y in xys[start:end].tolist()])
+            for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def compute_chunk(mode: str, xys_p: np.ndarray, offsets_p: np.ndarray,
+                  xys_q: np.ndarray, offsets_q: np.ndarray):
+    """
+    Results of compute_many for a chunk of packed pairs of curves: the
+    distances, or the epsilons and the packed matchings. A pair that fails
+    (e.g. a curve of a single point) gets NaN and an empty matching.
+    """
+    pairs = zip(unpack_curves(xys_p, offsets_p),
+                unpack_curves(xys_q, offsets_q))
+    epsilons = []
+    matchings = []
+    for i_pair, (points_p, points_q) in enumerate(pairs):
+        matching = []
+        try:
+            if mode == "distance":
+                epsilon = frechet_distance(points_p, points_q)
+            else:
+                # the traversal prints its progress, nobody reads it here
+                with contextlib.redirect_stdout(io.StringIO()):
+                    cell_matrix = CellMatrix(points_p, points_q, traverse=1,
+                                             max_traversals=1)
+                epsilon = cell_matrix.max_epsilon
+                if len(cell_matrix.traversals) > 0:
+                    matching = cell_matrix.traversals[0].points
+        except Exception as error:
+            # one bad pair must not cost the rest of the batch
+            print("Error: pair " + str(i_pair) + " of the chunk failed: " +
+                  repr(error))
+            epsilon, matching = math.nan, []
+        epsilons.append(epsilon)
+        matchings.append(matching)
+    if mode == "distance":
+        return np.array(epsilons, dtype=np.float64)
+    return (np.array(epsilons, dtype=np.float64),) + pack_curves(matchings)
+
+
+def compute_many(pairs, workers: int = None, mode: str = "distance",
+                 chunk_size: int = batch_pairs,
+                 executor: ProcessPoolExecutor = None):
+    """
+    Frechet distances (mode "distance") or matchings (mode "matching") of
+    many pairs of curves (lists of Vectors or n x 2 arrays) on a pool of
+    workers processes (None: one per CPU), or on the given executor, which
+    is left running. The pairs are sent in chunks of chunk_size as packed
+    arrays. Generates (index of the pair, result) as the chunks complete,
+    the result is the distance or the epsilon and the points of the first
+    traversal (n x 2 array) in the cell matrix. Pairs that fail get NaN
+    (and no points), the other pairs are still computed.
+    """
+    if mode not in compute_modes:
+        raise ValueError("Error: unknown mode: " + str(mode))
+    # chunks in flight, so the pairs are read as the workers need them
+    window = 2 * (workers or os.cpu_count() or 1)
+
+    pairs = enumerate(pairs)
+    pending = {}
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(workers)
+    try:
+        while True:
+            while len(pending) < window:
+                chunk = list(itertools.islice(pairs, chunk_size))
+                if len(chunk) == 0:
+                    break
+                future = executor.submit(
+                    compute_chunk, mode,
+                    *pack_curves([pair[0] for _, pair in chunk]),
+                    *pack_curves([pair[1] for _, pair in chunk]))
+                pending[future] = [index for index, _ in chunk]
+            if len(pending) == 0:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                indices = pending.pop(future)
+                if mode == "distance":
+                    yield from zip(indices, future.result().tolist())
+                    continue
+                epsilons, xys, offsets = future.result()
+                for index, epsilon, start, end in zip(
+                        indices, epsilons.tolist(), offsets[:-1],
+                        offsets[1:]):
+                    yield index, (epsilon, xys[start:end])
+    finally:
+        # stopped early or failed: drop the chunks that did not start yet
+        for future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=True)
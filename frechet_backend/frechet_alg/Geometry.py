@@ -15,7 +15,6 @@
 import math
 from typing import Tuple
 import numpy as np
-from bisect import bisect
 
 
 Bounds_2D = ((float, float), (float, float))
@@ -26,6 +25,37 @@ def about_equal(x1: float, x2: float, abs_tol=tol) -> bool:
     return math.isclose(x1, x2, abs_tol=abs_tol)
 
 
+def about_equal_array(x1: np.ndarray, x2: np.ndarray, abs_tol=tol) -> np.ndarray:
+    # element-wise about_equal, same semantics as math.isclose
+    x1 = np.asarray(x1, dtype=np.float64)
+    x2 = np.asarray(x2, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        d = np.abs(x1 - x2)
+        return (x1 == x2) | (np.isfinite(d) & (
+            d <= np.maximum(1e-9 * np.maximum(np.abs(x1), np.abs(x2)), abs_tol)))
+
+
+def cut_array(starts1: np.ndarray, ends1: np.ndarray, starts2: np.ndarray,
+              ends2: np.ndarray) -> (np.ndarray, np.ndarray):
+    # element-wise Bounds1D.cut, empty bounds are (inf, -inf)
+    new_starts = np.maximum(starts1, starts2)
+    new_ends = np.minimum(ends1, ends2)
+    equal = about_equal_array(new_starts, new_ends)
+    empty = ~equal & (new_ends < new_starts)
+    starts = np.where(equal, np.minimum(new_starts, new_ends),
+                      np.where(empty, math.inf, new_starts))
+    ends = np.where(equal, np.maximum(new_starts, new_ends),
+                    np.where(empty, -math.inf, new_ends))
+    return starts, ends
+
+
+def contains_array(starts: np.ndarray, ends: np.ndarray, x: np.ndarray) -> np.ndarray:
+    # element-wise x in Bounds1D
+    return ~(ends < starts) & (((starts <= x) & (x <= ends)) |
+                               about_equal_array(starts, x) |
+                               about_equal_array(ends, x))
+
+
 class Bounds1D:
     def __init__(self, start: float, end: float):
         self.start = start
@@ -375,13 +405,35 @@ class LineSegment:
 
     def intersection_r_both(self, ls: 'LineSegment') -> (float, float):
         # calculates both parameters r of the intersection point (on self and on ls)
+        # solves p1 + self_r * d = ls.p1 + ls_r * ls.d with Cramer's rule
         if not about_equal(self.m, ls.m):
-            a = np.array([[-self.d.x, ls.d.x], [-self.d.y, ls.d.y]])
-            b = np.array([self.p1.x - ls.p1.x, self.p1.y - ls.p1.y])
-            [self_r, ls_r] = np.linalg.solve(a, b)
-            return self_r, ls_r
-        else:
-            return float('nan'), float('nan')
+            det = ls.d.x * self.d.y - self.d.x * ls.d.y
+            if det != 0:
+                b_x = self.p1.x - ls.p1.x
+                b_y = self.p1.y - ls.p1.y
+                self_r = (b_x * ls.d.y - ls.d.x * b_y) / det
+                ls_r = (self.d.y * b_x - self.d.x * b_y) / det
+                return self_r, ls_r
+        return float('nan'), float('nan')
+
+    @staticmethod
+    def intersection_r_both_array(p1s: np.ndarray, ds: np.ndarray,
+                                  ls_p1s: np.ndarray, ls_ds: np.ndarray) -> \
+            (np.ndarray, np.ndarray):
+        """
+        Vectorized intersection_r_both for arrays of line segments given by
+        start points and difference vectors (... x 2, broadcastable).
+        Returns both parameters r of the intersection points (nan if the
+        lines are parallel).
+        """
+        det = ls_ds[..., 0] * ds[..., 1] - ds[..., 0] * ls_ds[..., 1]
+        b_x = p1s[..., 0] - ls_p1s[..., 0]
+        b_y = p1s[..., 1] - ls_p1s[..., 1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            det = np.where(det == 0, np.nan, det)
+            self_r = (b_x * ls_ds[..., 1] - ls_ds[..., 0] * b_y) / det
+            ls_r = (ds[..., 1] * b_x - ds[..., 0] * b_y) / det
+        return self_r, ls_r
 
     def intersection_r(self, ls: 'LineSegment') -> float:  # calculates the parameter r of the intersection point
         return self.intersection_r_both(ls)[0]
@@ -392,7 +444,7 @@ class LineSegment:
 
     def intersection_rl_both(self, ls: 'LineSegment') -> float:
         # calculates both parameters rl of the intersection point (on self and on ls)
-        self_r, ls_r = self.intersection_r(ls)
+        self_r, ls_r = self.intersection_r_both(ls)
         return self_r * self.l, ls_r * ls.l
 
     def intersection_rl(self, ls: 'LineSegment') -> float:  # calculates the parameter rl of the intersection point
@@ -481,19 +533,20 @@ class Path:
         self.points = points
         self.count = len(points) - 1
         self.segments = []
-        self.length = 0
-        self.lengths = []
-        self.offsets = [0]
 
         for i_segment in range(self.count):
             p1 = points[i_segment]
             p2 = points[i_segment + 1]
-            segment = LineSegment(p1, p2)
-            self.segments.append(segment)
-            length = segment.l
-            self.length += length
-            self.lengths.append(length)
-            self.offsets.append(self.length)
+            self.segments.append(LineSegment(p1, p2))
+
+        # array representation: vertices (count+1 x 2), segment difference
+        # vectors and lengths (count) and offsets (count+1)
+        self.vertices = np.array([point.to_tuple() for point in points],
+                                 dtype=np.float64).reshape(-1, 2)
+        self.d = np.diff(self.vertices, axis=0)
+        self.lengths = np.sqrt(self.d[:, 0]**2 + self.d[:, 1]**2)
+        self.offsets = np.concatenate(([0.0], np.cumsum(self.lengths)))
+        self.length = float(self.offsets[-1])
 
         self.bounds = Bounds1D(0, self.length)
 
@@ -511,25 +564,88 @@ class Path:
     # Path Arithmetic
 
     def i_rl_path(self, rl: float) -> int:  # path index for set parameter rl
-        rl = self.bounds.to_bounds(rl)
-        return min(self.i_rl_point(rl), self.count - 1)
+        return int(self.i_rl_paths(rl))
 
     def i_rl_point(self, rl: float) -> int:  # point index for set parameter rl
-        rl = self.bounds.to_bounds(rl)
-
-        i_segment = bisect(self.offsets[1:], rl)
-        if i_segment > 0 and about_equal(rl, self.offsets[i_segment - 1]):
-            return i_segment - 1
-        if i_segment < self.count and about_equal(rl, self.offsets[i_segment + 1]):
-            return i_segment + 1
-        return i_segment
+        return int(self.i_rl_points(rl))
 
     def p_rl(self, rl: float) -> Vector:  # point for set parameter rl
-        i_segment = self.i_rl_path(rl)
-
-        if math.isnan(i_segment):
-            return Vector.nan()
-        return self.segments[i_segment].frl(rl - self.offsets[i_segment])
+        return Vector.from_tuple(self.p_rls(rl))
+
+    # Path Arithmetic (vectorized)
+
+    def i_rl_paths(self, rls: np.ndarray) -> np.ndarray:  # path indices for set parameters rl
+        return np.minimum(self.i_rl_points(rls), self.count - 1)
+
+    def i_rl_points(self, rls: np.ndarray) -> np.ndarray:  # point indices for set parameters rl
+        rls = np.clip(np.asarray(rls, dtype=np.float64), 0, self.length)
+
+        i_segments = np.searchsorted(self.offsets[1:], rls, side='right')
+        # snap to neighbouring points that are about equal
+        i_prev = np.maximum(i_segments - 1, 0)
+        i_next = np.minimum(i_segments + 1, self.count)
+        snap_prev = (i_segments > 0) & about_equal_array(rls, self.offsets[i_prev])
+        snap_next = (i_segments < self.count) & about_equal_array(rls, self.offsets[i_next])
+        return np.where(snap_prev, i_prev, np.where(snap_next, i_next, i_segments))
+
+    def p_rls(self, rls: np.ndarray) -> np.ndarray:  # points (k x 2) for set parameters rl
+        rls = np.asarray(rls, dtype=np.float64)
+        i_segments = self.i_rl_paths(rls)
+        rs = (rls - self.offsets[i_segments]) / self.lengths[i_segments]
+        return self.vertices[i_segments] + self.d[i_segments] * rs[..., np.newaxis]
+
+    def slopes(self) -> np.ndarray:  # slopes m of all segments (inf if vertical)
+        dx = self.d[:, 0]
+        vertical = about_equal_array(dx, 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(vertical, np.inf, self.d[:, 1] / np.where(vertical, 1, dx))
+
+    def project_points(self, points: np.ndarray, i_segments=slice(None)) -> \
+            (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Projects points (k x 2) onto the lines of all segments (or only the
+        segments selected by i_segments).
+        Returns arrays (count x k):
+        rl: parameter rl of the projection on the segment
+        d_l: closest distance of point to the line of the segment
+        d_ls: closest distance of point to the segment
+        """
+        p1s = self.vertices[:-1][i_segments]
+        p2s = self.vertices[1:][i_segments]
+        ds = self.d[i_segments]
+        w = points[np.newaxis, :, :] - p1s[:, np.newaxis, :]
+        dx = ds[:, 0, np.newaxis]
+        dy = ds[:, 1, np.newaxis]
+        ls = self.lengths[i_segments][:, np.newaxis]
+        rl = ((w[:, :, 0] * dx + w[:, :, 1] * dy) / (dy * dy + dx * dx)) * ls
+        d_l = np.abs(dx * w[:, :, 1] - dy * w[:, :, 0]) / ls
+        d_p1 = np.sqrt(w[:, :, 0]**2 + w[:, :, 1]**2)
+        w2 = points[np.newaxis, :, :] - p2s[:, np.newaxis, :]
+        d_p2 = np.sqrt(w2[:, :, 0]**2 + w2[:, :, 1]**2)
+        r = rl / ls
+        on_segment = (0 - tol <= r) & (r <= 1 + tol)
+        d_ls = np.where(on_segment, d_l, np.minimum(d_p1, d_p2))
+        return rl, d_l, d_ls
+
+    def hyperbolas_with_point(self, point: Vector) -> "HyperbolaArray":
+        # hyperbolas of all segments with point, moved to the segment offsets
+        rl, d_l, _ = self.project_points(np.array([point.to_tuple()]))
+        return HyperbolaArray(rl[:, 0] + self.offsets[:-1], d_l[:, 0])
+
+    def segment_hyperbolas_with_point(self, point: Vector,
+                                      i_segments: np.ndarray) -> "HyperbolaArray":
+        # hyperbolas of the selected segments with point, moved to the
+        # segment offsets; computed exactly like LineSegment.hyperbola_with_point
+        p = np.array(point.to_tuple())
+        ds = self.d[i_segments]
+        vs = np.stack((ds[:, 1], -ds[:, 0]), axis=-1)  # rotated 90° to the left
+        rs, _ = LineSegment.intersection_r_both_array(
+            self.vertices[i_segments], ds, p, (p + vs) - p)
+        d_l = np.abs(ds[:, 0] * (p[1] - self.vertices[i_segments, 1]) -
+                     ds[:, 1] * (p[0] - self.vertices[i_segments, 0])) / \
+            self.lengths[i_segments]
+        return HyperbolaArray(rs * self.lengths[i_segments] +
+                              self.offsets[i_segments], d_l)
 
 
 class Hyperbola:
@@ -650,6 +766,72 @@ class Hyperbola:
         return sample_points
 
 
+class HyperbolaArray:
+    """
+    Array of hyperbolas sqrt( s_y^2 + a * ( x - s_x )^2 ) of any shape.
+    Vectorized counterpart of Hyperbola: apexes s_x, s_y and coefficients a
+    are stored as arrays, so whole families (e.g. cross sections or rows of
+    cell borders) can be evaluated in one call.
+    """
+
+    def __init__(self, s_x: np.ndarray, s_y: np.ndarray, a: np.ndarray = None):
+        self.s_x = np.asarray(s_x, dtype=np.float64)
+        self.s_y = np.asarray(s_y, dtype=np.float64)
+        if a is None:
+            a = np.ones_like(self.s_x)
+        self.a = np.broadcast_to(np.asarray(a, dtype=np.float64), self.s_x.shape)
+
+    def __str__(self):
+        return "hyperbolas: S_x" + str(self.s_x) + " S_y" + str(self.s_y) + \
+               " a" + str(self.a)
+
+    def __len__(self):
+        return len(self.s_x)
+
+    def __getitem__(self, item):
+        s_x = self.s_x[item]
+        if np.ndim(s_x) == 0:
+            return Hyperbola(Vector(s_x, self.s_y[item]), float(self.a[item]))
+        return HyperbolaArray(s_x, self.s_y[item], self.a[item])
+
+    @property
+    def shape(self) -> tuple:
+        return self.s_x.shape
+
+    @property
+    def T(self) -> "HyperbolaArray":
+        return HyperbolaArray(self.s_x.T, self.s_y.T, self.a.T)
+
+    def fx(self, x: np.ndarray) -> np.ndarray:  # y-values for set x-values
+        return np.sqrt(self.s_y**2 + self.a * (x - self.s_x)**2)
+
+    def fy(self, y: np.ndarray) -> (np.ndarray, np.ndarray):
+        # x-values for set y-values: interval (start, end), nan if none
+        y = np.asarray(y, dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            w = np.sqrt((y**2 - self.s_y**2) / self.a)
+        equal = about_equal_array(y, self.s_y)
+        w = np.where(equal, 0.0, np.where(y < self.s_y, np.nan, w))
+        return self.s_x - w, self.s_x + w
+
+    def free_bounds(self, y: float, starts: np.ndarray, ends: np.ndarray) -> \
+            (np.ndarray, np.ndarray):
+        # intervals of x-values with f(x) <= y cut to the bounds (starts, ends),
+        # empty intervals are (inf, -inf)
+        free_starts, free_ends = self.fy(y)
+        empty = np.isnan(free_starts)
+        return cut_array(starts, ends, np.where(empty, math.inf, free_starts),
+                         np.where(empty, -math.inf, free_ends))
+
+    def orientation(self, x: np.ndarray) -> np.ndarray:
+        # for set x: returns negative if falling, 0 if constant, positive if rising
+        d = x - self.s_x
+        return np.where(about_equal_array(x, self.s_x), 0.0, d)
+
+    def reflect_x(self, x: np.ndarray) -> "HyperbolaArray":  # reflects hyperbolas over verticals at set x
+        return HyperbolaArray(self.s_x + 2 * self.orientation(x), self.s_y, self.a)
+
+
 class Ellipse:
     def __init__(self, m: Vector, a: Vector, b: Vector):
         self.m = m  # midpoint